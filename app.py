@@ -1,18 +1,33 @@
 import streamlit as st
-import google.generativeai as genai
-import gspread
-from google.oauth2.service_account import Credentials
+import time
+RUN_T0 = time.perf_counter() # this rerun's startup marks are measured from here
 import pandas as pd
 from io import BytesIO
-from PIL import Image
-import requests
 import json
-import time
 import difflib
 import re
 import ast
 import asyncio 
-import feedparser # NEW: For Live MLB News
+import hashlib
+import importlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from name_index import NameMatcher, PlayerNameIndex, normalize_name
+from llm_cache import LLMCache, make_key
+from league_context import build_roster_context, estimate_tokens, find_mentions, format_team
+from openrouter_client import OpenRouterClient, LLMError, LLMCallError
+from council import LatencyStats, run_council
+from sheet_repo import SheetRepository, SheetConflict, ranges_from_cells
+from league_model import LeagueModel, patch_matrix
+from job_runner import JobRunner
+from news_feed import NewsPoller, NewsStore
+from sheet_mirror import SheetMirror
+from valuation import ValuationEngine, load_projections
+import tracing
+from tracing import measure, span, traced
 
 # --- 1. GLOBAL MASTER CONFIGURATION ---
 SHEET_ID = "1-EDI4TfvXtV6RevuPLqo5DKUqZQLlvfF2fKoMDnv33A"
@@ -22,63 +37,322 @@ TEAM_NAMES = [
     "Guti Gang", "Happy", "Hit it Hard Hit it Far", 
     "ManBearPuig", "Milwaukee Beers", "Seiya Later", "Special Eds"
 ]
+TEAM_MATCHER = NameMatcher(TEAM_NAMES)
+CONTEXT_TOKEN_BUDGET = 3000 # max roster tokens sent in a council brief
+JOB_WORKERS = 4 # background analyses running at once (identical requests share one job)
+COUNCIL_BUDGET = 60 # default deadline-mode budget (s) for a whole analysis
+COUNCIL_TIMEOUTS = {"Research": 20, "Gemini": 45, "GPT": 45, "Claude": 45} # per-member caps inside the budget
+SHEET_TTL = 600 # seconds a worksheet's values are served from the repository cache
+BLOCK_HEADER = ["Team","Player","Position","Grade","Verdict","Impact %","Outlook Shift","Analysis","Timestamp"]
+MODEL_REFRESH_SECS = 3600 # background re-discovery of Gemini models
+FALLBACK_MODEL = "gemini-1.5-flash"
+CACHE_DIR = ".gm_cache"
+TRACE_FILE = os.path.join(CACHE_DIR, "trace.jsonl") # rotating per-phase spans (see tracing.py)
+PERF_RUNS = 20 # recent runs summarized in the sidebar Perf view
+CACHE_TTLS = { # seconds an identical AI answer stays fresh, per task
+    "Research": 6 * 3600, "Trade": 3600, "Finder": 3600, "Scout": 6 * 3600,
+    "Sleepers": 12 * 3600, "Targets": 6 * 3600, "Draft": 24 * 3600, "Block": 6 * 3600,
+    "Vision": 7 * 24 * 3600, "Position": 365 * 24 * 3600
+}
+GEMINI_THREADS = 16 # blocking Gemini SDK calls in flight at once (see get_gemini_pool)
+ORGANIZER_CONCURRENCY = 4 # teams classified by Gemini at once
+NEWS_FEEDS = [ # polled in the background with conditional GETs; items deduped across feeds
+    "https://www.mlb.com/feeds/news/rss.xml",
+    "https://www.mlbtraderumors.com/feed",
+    "https://www.espn.com/espn/rss/mlb/news",
+    "https://www.cbssports.com/rss/headlines/mlb/",
+]
+NEWS_POLL_SECS = 600
+NEWS_MAX_ITEMS = 1000 # on-disk store bound
+PAGE_SIZE = 50 # rows per page in the History / Trade Block views (served from the local mirror)
+PROJECTIONS_FILE = "projections.csv" # local CSV/Parquet: Player + category columns (valuation.CATEGORIES), optional Age/Rank
+FINDER_TOP_N = 8 # locally pre-screened trades handed to the council
+FINDER_TARGETS = { # Finder target -> filter on incoming players (None: anyone with projections)
+    "Elite Prospects (Top 100)": lambda p: p["Rank"] <= 100 if "Rank" in p else None,
+    "MLB-Ready Youth (<24yo)": lambda p: p["Age"] < 24 if "Age" in p else None,
+    "Win-Now Veterans": lambda p: p["Age"] >= 29 if "Age" in p else None,
+    "Buy-Low Candidates": lambda p: None,
+    "2026 SP Help": lambda p: p["Category"] == "Pitcher",
+}
+RUN_MARKS = {"imports": round((time.perf_counter() - RUN_T0) * 1000)} # phase -> ms since RUN_T0, this rerun
 
 # --- 2. CORE UTILITY ENGINE (CACHED & SAFE) ---
+@st.cache_resource
+def get_boot_stats():
+    return {"imports": {}, "cold": None} # per process: first-import costs and the first run's marks
+
+def lazy_import(name):
+    """Import a heavy module (genai, gspread, PIL) on first use, recording its cost for the startup report."""
+    fresh = name not in sys.modules; t0 = time.perf_counter()
+    mod = importlib.import_module(name)
+    if fresh: get_boot_stats()["imports"][name] = round((time.perf_counter() - t0) * 1000)
+    return mod
+
+def mark(phase):
+    RUN_MARKS[phase] = round((time.perf_counter() - RUN_T0) * 1000)
+
+def marks_line(marks):
+    prev, parts = 0, []
+    for phase, ms in marks.items(): parts.append(f"{phase} {ms - prev}ms"); prev = ms
+    return " · ".join(parts) + f" (total {prev}ms)"
+
+@st.cache_resource
 def get_gspread_client():
+    gspread = lazy_import("gspread"); Credentials = lazy_import("google.oauth2.service_account").Credentials
     info = dict(st.secrets["gcp_service_account"])
     key = info["private_key"].replace("\\n", "\n")
     scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
     creds = Credentials.from_service_account_info(info, scopes=scopes)
     return gspread.authorize(creds)
 
-def convert_df_to_excel(df):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False)
-    return output.getvalue()
+@st.cache_resource
+def get_spreadsheet():
+    return get_gspread_client().open_by_key(SHEET_ID)
+
+@st.cache_resource
+def get_sheet_repo():
+    return SheetRepository(get_spreadsheet(), ttl=SHEET_TTL)
+
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache(os.path.join(CACHE_DIR, "llm_cache.sqlite"), ttls=CACHE_TTLS)
+
+@st.cache_resource
+def get_openrouter_client():
+    return OpenRouterClient(st.secrets["OPENROUTER_API_KEY"], referer="https://streamlit.io")
+
+@st.cache_resource
+def get_tracer():
+    return tracing.configure(TRACE_FILE)
+
+@st.cache_resource
+def get_news_poller():
+    return NewsPoller(NewsStore(os.path.join(CACHE_DIR, "news.sqlite"), NEWS_MAX_ITEMS), NEWS_FEEDS, NEWS_POLL_SECS)
+
+@st.cache_resource
+def get_sheet_mirror():
+    return SheetMirror(os.path.join(CACHE_DIR, "sheets.sqlite"), ttl=SHEET_TTL)
+
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(max_workers=JOB_WORKERS)
+
+@st.cache_resource
+def get_gemini_pool():
+    # not the event loop's default executor: asyncio.run joins that one on exit, so a hung
+    # Gemini call would hold a deadline-mode analysis (or a background job) until it returned
+    return ThreadPoolExecutor(GEMINI_THREADS, thread_name_prefix="gemini")
+
+@st.cache_resource
+def get_latency_stats():
+    return LatencyStats()
 
 def flatten_roster_to_df(league_data):
-    flat_data = []
-    for team, players in league_data.items():
-        current_cat = "Unknown"
-        for p in players:
-            name = p['name']
-            if "HITTERS:" in name:
-                current_cat = "Hitter"
-                continue
-            elif "PITCHERS:" in name:
-                current_cat = "Pitcher"
-                continue
-            flat_data.append({"Team": team, "Player": name, "Category": current_cat})
-    return pd.DataFrame(flat_data)
+    # categories come pre-resolved from the HITTERS:/PITCHERS: sections at parse time
+    flat_data = [{"Team": team, "Player": p.name, "Category": p.category} for team, players in league_data.items() for p in players]
+    return pd.DataFrame(flat_data, columns=["Team", "Player", "Category"])
+
+@st.cache_resource(max_entries=2)
+def get_valuation_engine(generation, _league_data, projections_mtime):
+    # keyed on the roster generation and the projections file's mtime
+    proj = load_projections(PROJECTIONS_FILE)
+    if proj is None: return None
+    with span("valuation.build"): return ValuationEngine(flatten_roster_to_df(_league_data), proj)
+
+def valuation_engine(league_data):
+    """Projections joined to the current rosters, or None without a projections file."""
+    try: mtime = os.path.getmtime(PROJECTIONS_FILE)
+    except OSError: return None
+    repo = get_sheet_repo()
+    return get_valuation_engine(repo.generation(repo.title_at(1)), league_data, mtime)
+
+def scour_league(engine, target, offer, name_index):
+    """Top feasible trades for USER_TEAM, scored locally over the whole league."""
+    give = [m["name"] for m in get_fuzzy_matches(offer, USER_TEAM, name_index) if m and m.get("row") != -1]
+    mask = FINDER_TARGETS.get(target, lambda p: None)(engine.players)
+    with span("valuation.search", teams=len(engine.teams), players=len(engine)):
+        return engine.search(USER_TEAM, FINDER_TOP_N, give=give or None, targets=mask)
+
+def candidates_brief(cands, target):
+    lines = [f"{i}. Give {r['Give']} to {r['Partner']} for {r['Get']} ({r['Type']}; need-weighted gain: you {r['Your Gain']}, them {r['Their Gain']})"
+             for i, r in enumerate(cands.to_dict("records"), 1)]
+    return (f"Find trades to get {target} for {USER_TEAM}. These candidates were pre-screened with projections "
+            f"(gains are category z-scores weighted by each team's needs):\n" + "\n".join(lines) +
+            "\nRank the best 3 using Dynasty Rankings and say what each partner would push back on.")
+
+def trade_impact(query, league_data, name_index):
+    """(team, before/after category strength) for the players a trade query names; None if it can't be valued."""
+    engine = valuation_engine(league_data)
+    if engine is None: return None
+    teams, players = find_mentions(query, league_data, name_index)
+    if not players: return None
+    team = USER_TEAM if USER_TEAM in teams else players[0][1]
+    give = [p for p, t in players if t == team]; get = [p for p, t in players if t != team]
+    return team, engine.impact(team, give, get)
 
 # --- 3. AI ENGINES (ASYNC, PARALLEL & DEEP) ---
+class GeminiModelRegistry:
+    """Resolves the newest flash-class model once, then re-lists models on a daemon thread."""
+    def __init__(self, api_key, refresh_secs=MODEL_REFRESH_SECS):
+        self._genai = genai = lazy_import("google.generativeai")
+        genai.configure(api_key=api_key)
+        self._lock = threading.Lock()
+        self.name, self.refreshed_at, self.error = FALLBACK_MODEL, None, None
+        self._model = genai.GenerativeModel(FALLBACK_MODEL)
+        self.refresh()
+        threading.Thread(target=self._loop, args=(refresh_secs,), name="gemini-models", daemon=True).start()
+
+    def _loop(self, every):
+        while True: time.sleep(every); self.refresh()
+
+    def refresh(self):
+        try:
+            models = [m.name for m in self._genai.list_models() if 'generateContent' in m.supported_generation_methods]
+            flash_models = [m for m in models if '1.5' in m or '2.0' in m]
+            flash_models.sort(reverse=True)
+            name = flash_models[0]
+        except Exception as e: self.error = str(e); return
+        with self._lock:
+            if name != self.name: self._model = self._genai.GenerativeModel(name); self.name = name
+            self.refreshed_at, self.error = time.time(), None
+
+    def model(self):
+        with self._lock: return self._model
+
+@st.cache_resource
+def get_model_registry():
+    return GeminiModelRegistry(st.secrets["GEMINI_API_KEY"])
+
 def get_active_model():
-    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    try:
-        models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-        flash_models = [m for m in models if '1.5' in m or '2.0' in m]
-        flash_models.sort(reverse=True)
-        return genai.GenerativeModel(flash_models[0])
-    except: return genai.GenerativeModel('gemini-1.5-flash')
-
-async def async_call_openrouter(model_id, persona, prompt):
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {st.secrets['OPENROUTER_API_KEY']}", "HTTP-Referer": "https://streamlit.io"}
-    data = {"model": model_id, "messages": [{"role": "system", "content": persona}, {"role": "user", "content": prompt}]}
-    loop = asyncio.get_event_loop()
-    try:
-        response = await loop.run_in_executor(None, lambda: requests.post(url, headers=headers, json=data, timeout=45)) # Increased timeout for deep thought
-        return response.json()['choices'][0]['message']['content'] if response.status_code == 200 else f"Error {response.status_code}"
-    except Exception as e: return f"Error: {e}"
+    return get_model_registry().model()
+
+@st.cache_resource
+def warmup():
+    """
+    Startup handshakes (auth, model discovery, pools) run once per process, in parallel.
+    Only Sheets blocks the first paint; the AI clients (and the genai import) finish in the background.
+    """
+    steps = {"Sheets": get_spreadsheet, "Gemini": get_model_registry, "OpenRouter": get_openrouter_client, "AI Cache": get_llm_cache}
+    def run(fn):
+        t0 = time.perf_counter()
+        try: fn(); return True, round(time.perf_counter() - t0, 2), ""
+        except Exception as e: return False, round(time.perf_counter() - t0, 2), str(e)
+    pool = ThreadPoolExecutor(len(steps), thread_name_prefix="warmup")
+    futures = {name: pool.submit(run, fn) for name, fn in steps.items()}
+    pool.shutdown(wait=False); futures["Sheets"].result()
+    return futures
+
+def health_status(health):
+    """{step: (ok, secs, error)}; ok is None while a background handshake is still running."""
+    return {step: f.result() if f.done() else (None, None, "") for step, f in health.items()}
+
+STREAM_REFRESH = 0.1 # min seconds between panel repaints while streaming
+
+async def iterate_in_thread(make_iter):
+    """Drive a blocking iterator (SSE lines, Gemini chunks) on a worker thread, yielding items here."""
+    loop = asyncio.get_running_loop(); q = asyncio.Queue(); done = object()
+    def put(item):
+        try: loop.call_soon_threadsafe(q.put_nowait, item); return True
+        except RuntimeError: return False # loop closed: the run ended at its deadline, drop the rest
+    def pump():
+        try:
+            for item in make_iter():
+                if not put(item): return
+        except Exception as e: put(e)
+        put(done)
+    worker = loop.run_in_executor(get_gemini_pool(), pump)
+    while (item := await q.get()) is not done:
+        if isinstance(item, Exception): raise item
+        yield item
+    await worker
+
+async def stream_to_panel(chunks, on_token):
+    """Accumulate text chunks, repainting `on_token(text_so_far)` at most every STREAM_REFRESH s."""
+    text, last = "", 0.0
+    async for c in chunks:
+        text += c
+        if time.perf_counter() - last >= STREAM_REFRESH: on_token(text); last = time.perf_counter()
+    on_token(text)
+    return text
+
+async def async_call_openrouter(model_id, persona, prompt, task=None, roster_ver="", bypass=False, on_token=None):
+    # task=None skips the disk cache; errors (LLMError) are never cached. on_token streams partial text (SSE).
+    cache = get_llm_cache(); key = make_key("openrouter", model_id, persona, prompt, roster_ver)
+    if task and not bypass:
+        hit = cache.get(key)
+        if hit is not None:
+            if on_token: on_token(hit)
+            return hit
+    client = get_openrouter_client()
+    messages = [{"role": "system", "content": persona}, {"role": "user", "content": prompt}]
+    with span("openrouter", model=model_id, task=task, stream=bool(on_token)) as s:
+        measure(s, sent=[persona, prompt])
+        if on_token:
+            try: result = await stream_to_panel(client.stream(model_id, messages), on_token)
+            except LLMCallError as e: s["error"] = f"LLMError {e.error.status}"; return e.error
+        else:
+            result = await client.chat(model_id, messages)
+            if isinstance(result, LLMError): s["error"] = f"LLMError {result.status}"; return result
+        measure(s, received=result)
+    if task: cache.put(key, result, task=task, model=model_id)
+    return result
+
+async def async_call_gemini(prompt, task=None, roster_ver="", bypass=False, on_token=None):
+    model = get_active_model()
+    cache = get_llm_cache(); key = make_key("gemini", model.model_name, prompt, roster_ver)
+    if task and not bypass:
+        hit = cache.get(key)
+        if hit is not None:
+            if on_token: on_token(hit)
+            return hit
+    if on_token:
+        with span("gemini", model=model.model_name, task=task, stream=True) as s:
+            chunks = iterate_in_thread(lambda: (c.text for c in model.generate_content(prompt, stream=True)))
+            result = await stream_to_panel(chunks, on_token); measure(s, prompt, result)
+    else: result = await traced_generate("gemini", model, prompt, task=task)
+    if task: cache.put(key, result, task=task, model=model.model_name)
+    return result
+
+async def traced_generate(phase, model, contents, **attrs):
+    """Unstreamed generate_content on a worker thread, inside a span; returns the response text."""
+    with span(phase, model=model.model_name, **attrs) as s:
+        resp = await asyncio.get_running_loop().run_in_executor(get_gemini_pool(), model.generate_content, contents)
+        measure(s, contents, resp.text)
+        usage = getattr(resp, "usage_metadata", None) # real counts when the API reports them
+        if usage and usage.prompt_token_count: s["tokens_in"], s["tokens_out"] = usage.prompt_token_count, usage.candidates_token_count
+        return resp.text
 
-async def async_run_deep_analysis(query, league_data, intel_data, task="Trade"):
+@contextmanager
+def pipeline_phase(label, report=None, progress=None):
+    """Spinner on the script thread; inside a background job, report the phase instead."""
+    if report: report(label, progress); yield
+    else:
+        with st.spinner(label): yield
+
+async def async_run_deep_analysis(query, league_data, intel_data, task="Trade", bypass=False, panels=None, budget=None, hedge=False, report=None):
     """
     THE 'ORACLE' ENGINE:
     1. Extracts 'Current Value' vs 'Future Value' (3-Year Window).
     2. Checks 'Team Fit' based on roster construction.
     3. Simulates 'Win Probability' impact.
+    panels: optional {"Research"/"Gemini"/"GPT"/"Claude": fn(text)} to stream each answer as it arrives.
+    budget: deadline mode (seconds); members still running at the deadline come back as "pending".
+    report: optional fn(phase, progress) used instead of spinners when running as a background job.
     """
+    panels = panels or {}; timing = {}; t_start = time.perf_counter()
+
+    def tracker(member):
+        if member not in panels: return None
+        t0 = time.perf_counter()
+        def on_token(text):
+            timing.setdefault(member, {"ttft": round(time.perf_counter() - t0, 2)})
+            panels[member](text)
+        return on_token
+
+    async def timed(member, coro):
+        t0 = time.perf_counter(); out = await coro
+        timing.setdefault(member, {})["total"] = round(time.perf_counter() - t0, 2)
+        return out
     
     # 1. DEEP RESEARCH: The "Source of Truth"
     search_prompt = f"""
@@ -91,8 +365,13 @@ async def async_run_deep_analysis(query, league_data, intel_data, task="Trade"):
     4. **Injury Risk**: Check recent news.
     """
     
-    with st.spinner(f"📡 War Room: {task} Protocol (Phase 1: Deep Web Audit)..."):
-        search_res = await async_call_openrouter("perplexity/sonar", "Lead Scout.", search_prompt)
+    roster_ver = make_key(league_data, intel_data)[:16]
+    with pipeline_phase(f"📡 War Room: {task} Protocol (Phase 1: Deep Web Audit)...", report, 0.1):
+        research = timed("Research", async_call_openrouter("perplexity/sonar", "Lead Scout.", search_prompt, "Research", "", bypass, tracker("Research")))
+        if budget is None: search_res = await research
+        else:
+            try: search_res = await asyncio.wait_for(research, timeout=min(COUNCIL_TIMEOUTS["Research"], budget / 2))
+            except asyncio.TimeoutError: search_res = "⏳ Research pending: skipped to stay within the time budget."
     
     # 2. THE COUNCIL DELIBERATION
     mandate = """
@@ -112,42 +391,176 @@ async def async_run_deep_analysis(query, league_data, intel_data, task="Trade"):
     
     brief = f"ROSTERS: {league_data}\nINTEL: {intel_data}\nDEEP RESEARCH: {search_res}\nQUERY: {query}\nMANDATE: {mandate}"
     
-    with st.spinner("⚔️ Council Deliberating (Simulating 3-Year Outcomes)..."):
-        task_gemini = asyncio.to_thread(get_active_model().generate_content, f"Lead GM Verdict. {brief}")
-        task_gpt = async_call_openrouter("openai/gpt-4o", "Market Expert (Fangraphs Logic).", brief)
-        task_claude = async_call_openrouter("anthropic/claude-3.5-sonnet", "Strategist (Game Theory).", brief)
-        
-        res_gemini, res_gpt, res_claude = await asyncio.gather(task_gemini, task_gpt, task_claude)
-        
-    return {
-        "Research": search_res,
-        "Gemini": res_gemini.text,
-        "GPT": res_gpt,
-        "Claude": res_claude
+    # hedged duplicates (h=True) run unstreamed so they never fight the primary over a panel
+    members = {
+        "Gemini": lambda h: async_call_gemini(f"Lead GM Verdict. {brief}", task, roster_ver, bypass, None if h else tracker("Gemini")),
+        "GPT": lambda h: async_call_openrouter("openai/gpt-4o", "Market Expert (Fangraphs Logic).", brief, task, roster_ver, bypass, None if h else tracker("GPT")),
+        "Claude": lambda h: async_call_openrouter("anthropic/claude-3.5-sonnet", "Strategist (Game Theory).", brief, task, roster_ver, bypass, None if h else tracker("Claude")),
     }
+    left = None if budget is None else max(budget - (time.perf_counter() - t_start), 1)
+    with pipeline_phase("⚔️ Council Deliberating (Simulating 3-Year Outcomes)...", report, 0.4):
+        verdicts = await run_council(members, budget=left, timeouts=COUNCIL_TIMEOUTS if budget else None, stats=get_latency_stats(), hedge=hedge)
 
-def run_fast_analysis(query, league_data, intel_data, task):
-    return asyncio.run(async_run_deep_analysis(query, league_data, intel_data, task))
+    out = {"Research": search_res, "Tokens": estimate_tokens(brief), "Timing": timing, "Council": {}}
+    for member, v in verdicts.items():
+        if v.status == "pending": text = f"⏳ Pending: no verdict within the {budget}s budget."
+        elif v.status == "timeout": text = f"⏱️ Timed out after {v.seconds}s."
+        else: text = v.text
+        out[member] = text
+        out["Council"][member] = {"status": v.status, "seconds": v.seconds, "hedged": v.hedged}
+        if v.seconds is not None and v.status != "pending": timing.setdefault(member, {})["total"] = v.seconds
+        if member in panels: panels[member](text)
+    return out
+
+def roster_context(query, league_data, name_index):
+    return build_roster_context(query, league_data, name_index, USER_TEAM, CONTEXT_TOKEN_BUDGET)
+
+def analysis_settings():
+    """(bypass, budget, hedge) from the sidebar; read on the script thread, never inside a job."""
+    bypass = st.session_state.get("bypass_ai_cache", False)
+    deadline = st.session_state.get("deadline_mode", False)
+    budget = st.session_state.get("council_budget", COUNCIL_BUDGET) if deadline else None
+    return bypass, budget, deadline and st.session_state.get("hedge_requests", True)
+
+def analysis_job(job, query, league_data, intel_data, task, settings):
+    # streamed text lands in job.partial; the polling fragment renders it
+    panels = {m: (lambda text, m=m: job.partial.__setitem__(m, text)) for m in ("Research", "Gemini", "GPT", "Claude")}
+    bypass, budget, hedge = settings
+    with tracing.run(f"analysis.{task}"):
+        return asyncio.run(async_run_deep_analysis(query, league_data, intel_data, task, bypass, panels, budget, hedge, job.report))
+
+def submit_analysis(slot, query, league_data, intel_data, task):
+    """Start a background analysis for this tab slot, unless the same request is running or has succeeded there."""
+    settings = analysis_settings()
+    key = make_key("analysis", query, league_data, intel_data, task, *settings)
+    tracked = st.session_state.get(f"job_{slot}")
+    if tracked and tracked["key"] == key:
+        job = get_job_runner().get(tracked["id"])
+        if (job and job.status != "error") or st.session_state.get("job_results", {}).get(slot, {}).get("id") == tracked["id"]: return
+    job = get_job_runner().submit(key, analysis_job, query, league_data, intel_data, task, settings, label=task)
+    st.session_state[f"job_{slot}"] = {"key": key, "id": job.id}
+
+def show_job(slot, render):
+    """Render a slot's job: live phase/progress and partial output while running, then the result."""
+    tracked = st.session_state.get(f"job_{slot}")
+    if not tracked: return
+    stored = st.session_state.setdefault("job_results", {}) # slot -> last result, so one per tab at most
+    job = get_job_runner().get(tracked["id"])
+    if job is None:
+        hit = stored.get(slot)
+        if hit and hit["id"] == tracked["id"]: render(hit["result"], True)
+        return
+    was_running = not job.done
+    def body():
+        if job.status == "running":
+            st.progress(job.progress, text=f"{job.phase} ({job.elapsed():.0f}s)")
+            render(job.partial, False)
+        elif job.status == "error": st.error(f"Analysis Failed: {job.error}")
+        else:
+            stored[slot] = {"id": job.id, "result": job.result}
+            render(job.result, True)
+        if was_running and job.done: st.rerun() # one full rerun to stop polling
+    st.fragment(body, run_every=0.5 if was_running else None)()
+
+def council_status_line(council):
+    icons = {"ok": "✅", "error": "❌", "timeout": "⏱️", "pending": "⏳"}
+    parts = []
+    for member, c in council.items():
+        detail = "pending" if c["status"] == "pending" else f"{c['seconds']}s" + (" (hedged)" if c["hedged"] else "")
+        parts.append(f"{icons.get(c['status'], '•')} {member} {detail}")
+    return "Council: " + " · ".join(parts)
+
+def timing_caption(timing, member):
+    t = timing.get(member, {})
+    parts = ([f"first token {t['ttft']}s"] if "ttft" in t else []) + ([f"done {t['total']}s"] if "total" in t else [])
+    return f"⏱️ {member}: " + " · ".join(parts) if parts else ""
 
 # --- 4. ADVANCED TRADE BLOCK ENGINE (JSON ENFORCED) ---
-async def process_block_images_async(image_files, user_roster, intel_data):
+VISION_MAX_PX = 1600 # screenshots are downscaled to fit this box before upload
+VISION_JPEG_QUALITY = 80
+VISION_CONCURRENCY = 12 # screenshots in flight at once (at most GEMINI_THREADS)
+RESEARCH_BATCH = 6 # min players per Perplexity call while screenshots are still coming in
+RESEARCH_MAX_BATCH = 30 # a call never carries more players than this
+RESEARCH_MODEL = "perplexity/sonar"
+
+def prepare_screenshot(raw):
+    """Downscaled JPEG image for one screenshot's bytes (CPU-bound: run it off the event loop)."""
+    Image = lazy_import("PIL.Image")
+    img = Image.open(BytesIO(raw)); img.thumbnail((VISION_MAX_PX, VISION_MAX_PX))
+    if img.mode not in ("RGB", "L"): img = img.convert("RGB")
+    buf = BytesIO(); img.save(buf, "JPEG", quality=VISION_JPEG_QUALITY, optimize=True); buf.seek(0)
+    return Image.open(buf)
+
+@traced("parse.names")
+def parse_name_lines(text):
+    names = []
+    for line in str(text).splitlines():
+        n = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).strip().strip("*").strip()
+        if n and len(n) <= 40 and not n.endswith(":"): names.append(n)
+    return names
+
+async def extract_screenshot_names(model, digest, raw, sem, bypass=False):
+    """Downscale and vision-pass one screenshot; results are cached by the upload's content hash."""
+    cache = get_llm_cache(); key = make_key("vision", model.model_name, digest)
+    hit = None if bypass else cache.get(key)
+    if hit is not None: return parse_name_lines(hit)
+    img = await asyncio.to_thread(prepare_screenshot, raw)
+    prompt = "List every player name visible in this screenshot. Ignore stats. Just names, one per line."
+    async with sem: text = await traced_generate("gemini.vision", model, [prompt, img])
+    cache.put(key, text, task="Vision", model=model.model_name)
+    return parse_name_lines(text)
+
+async def process_block_images_async(image_files, user_roster, intel_data, bypass=False, name_index=None):
     """
     The 'Deep Scout' Pipeline.
     Forces JSON structure even if the AI hallucinates text.
+    Screenshots are decoded and extracted concurrently. Research runs at most the provider's limit of
+    calls at once: while vision runs, half the slots take batches as enough new names arrive; the names
+    left when vision finishes are split across every free slot.
     """
     model = get_active_model()
     
-    # PHASE 1: VISION
-    prompt_extract = "List every player name visible in these screenshots. Ignore stats. Just names."
-    content_extract = [prompt_extract] + [Image.open(f) for f in image_files]
-    with st.spinner("👀 Phase 1: Vision Extraction..."):
-        extraction = await asyncio.to_thread(model.generate_content, content_extract)
-        player_list = extraction.text
-    
-    # PHASE 2: RESEARCH
-    search_prompt = f"Get 2026 ZiPS Projections and Dynasty Trade Value (Buy/Sell) for: {player_list}."
-    with st.spinner("📡 Phase 2: Market Valuation..."):
-        research_data = await async_call_openrouter("perplexity/sonar", "Scout", search_prompt)
+    # PHASE 1: VISION (one task per unique screenshot: downscale on a thread, then one vision call)
+    shots = {}
+    for f in image_files:
+        raw = f.getvalue() if hasattr(f, "getvalue") else f.read()
+        shots.setdefault(hashlib.sha256(raw).hexdigest(), raw)
+    sem = asyncio.Semaphore(VISION_CONCURRENCY)
+    extracting = {asyncio.ensure_future(extract_screenshot_names(model, d, raw, sem, bypass)) for d, raw in shots.items()}
+
+    # PHASE 2: RESEARCH (deduped names, batched to fit the provider's concurrency)
+    players, seen, waiting, running, results = [], set(), [], set(), []
+    limit = get_openrouter_client().limit(RESEARCH_MODEL)
+    def launch(names):
+        prompt = f"Get 2026 ZiPS Projections and Dynasty Trade Value (Buy/Sell) for: {', '.join(names)}."
+        running.add(asyncio.ensure_future(async_call_openrouter(RESEARCH_MODEL, "Scout", prompt, "Block", "", bypass)))
+    def fill_slots():
+        # while vision runs, early batches take at most half the slots; the rest wait for the final split
+        while waiting and len(running) < (limit // 2 if extracting else limit):
+            if extracting and len(waiting) < RESEARCH_BATCH: return
+            size = RESEARCH_MAX_BATCH if extracting else -(-len(waiting) // (limit - len(running)))
+            size = min(size, RESEARCH_MAX_BATCH)
+            launch(waiting[:size]); del waiting[:size]
+    prog = st.progress(0.0, text="👀 Phase 1: Vision Extraction...")
+    n_shots = len(extracting)
+    while extracting or running or waiting:
+        fill_slots()
+        done, _ = await asyncio.wait(extracting | running, return_when=asyncio.FIRST_COMPLETED)
+        for t in done:
+            if t in running: running.discard(t); results.append(t.result()); continue
+            extracting.discard(t)
+            for raw_name in t.result():
+                hit = name_index.lookup(raw_name, cutoff=0.85) if name_index else None
+                label = f"{hit['name']} ({name_index.team_of(hit['name'], cutoff=0.99)})" if hit else raw_name
+                key = (hit or {}).get("name", raw_name).lower()
+                if key in seen: continue
+                seen.add(key); players.append(label); waiting.append(label)
+        shown = n_shots - len(extracting)
+        prog.progress(shown / n_shots if n_shots else 1.0,
+                      text=f"👀 Screenshots {shown}/{n_shots} · 📡 {len(running)} research calls running, {len(results)} done")
+    research_data = "\n\n".join(results)
+    prog.empty()
+    player_list = "\n".join(players)
         
     # PHASE 3: SYNTHESIS
     final_prompt = f"""
@@ -161,54 +574,46 @@ async def process_block_images_async(image_files, user_roster, intel_data):
     CRITICAL: Return ONLY JSON.
     """
     with st.spinner("📝 Phase 4: Finalizing Report..."):
-        final_response = await asyncio.to_thread(model.generate_content, final_prompt)
-        return final_response.text
+        return await traced_generate("gemini.synthesis", model, final_prompt)
 
-def analyze_and_save_block_deep(image_files, user_roster, intel_data, sh):
+def analyze_and_save_block_deep(image_files, user_roster, intel_data, repo, name_index=None):
     try:
-        raw_text = asyncio.run(process_block_images_async(image_files, user_roster, intel_data))
-        clean_json = raw_text.replace("```json", "").replace("```", "").strip()
-        match = re.search(r"(\[.*\])", clean_json, re.DOTALL)
+        bypass = st.session_state.get("bypass_ai_cache", False)
+        with tracing.run("block.deep_scout"):
+            raw_text = asyncio.run(process_block_images_async(image_files, user_roster, intel_data, bypass, name_index))
+        with span("parse.block_json", chars=len(raw_text)):
+            clean_json = raw_text.replace("```json", "").replace("```", "").strip()
+            match = re.search(r"(\[.*\])", clean_json, re.DOTALL)
+            data = json.loads(match.group(1)) if match else None
         if match:
-            data = json.loads(match.group(1))
-            try: ws = sh.worksheet("Trade Block")
-            except: ws = sh.add_worksheet("Trade Block", 1000, 10); ws.append_row(["Team","Player","Position","Grade","Verdict","Impact %","Outlook Shift","Analysis","Timestamp"])
+            repo.ensure_worksheet("Trade Block", 1000, 10, BLOCK_HEADER)
             ts = time.strftime("%Y-%m-%d %H:%M")
             rows = [[d.get("Team"), d.get("Player"), d.get("Position"), d.get("Grade"), d.get("Verdict"), d.get("Impact_Pct"), d.get("Outlook_Shift"), d.get("Analysis"), ts] for d in data]
-            ws.append_rows(rows)
+            repo.append_rows("Trade Block", rows)
             return data
         return None
     except Exception as e: st.error(f"Analysis Failed: {e}"); return None
 
 # --- 5. LOGIC & PARSING ---
+@traced("parse.rosters")
 def parse_horizontal_rosters(matrix):
-    league_map = {}
-    if not matrix: return league_map
-    headers = [str(c).strip() for c in matrix[0]]
-    for t in TEAM_NAMES: league_map[t] = []
-    for col_idx, header_val in enumerate(headers):
-        match = difflib.get_close_matches(header_val, TEAM_NAMES, n=1, cutoff=0.9)
-        if match:
-            team_key = match[0]
-            for row_idx, row in enumerate(matrix[1:]):
-                if col_idx < len(row):
-                    val = str(row[col_idx]).strip()
-                    if val and not val.endswith(':'):
-                        league_map[team_key].append({"name": val, "row": row_idx + 2, "col": col_idx + 1})
-    return league_map
+    return LeagueModel.from_matrix(matrix, TEAM_MATCHER, TEAM_NAMES)
 
 def parse_trade_screenshot(image_file, team_names):
     model = get_active_model()
-    img = Image.open(image_file)
+    img = lazy_import("PIL.Image").open(image_file)
     prompt = f"Extract trade details. Expand abbreviations (Z. Neto -> Zach Neto). Match teams: {team_names}. Return JSON dict."
     with st.spinner("👀 Vision Processing..."):
         try:
-            res = model.generate_content([prompt, img]).text
-            clean = res.replace("```python", "").replace("```", "").replace("json", "").strip()
-            return ast.literal_eval(clean)
+            with span("gemini.vision", model=model.model_name, task="Trade") as s:
+                res = model.generate_content([prompt, img]).text; measure(s, prompt, res)
+            with span("parse.trade"):
+                clean = res.replace("```python", "").replace("```", "").replace("json", "").strip()
+                return ast.literal_eval(clean)
         except: return None
 
 def execute_hard_swap(matrix, team_a, players_a, team_b, players_b):
+    matrix = [list(r) for r in matrix] # leave the caller's copy intact so it can be diffed
     headers = [str(c).strip() for c in matrix[0]]
     try:
         idx_a = headers.index(difflib.get_close_matches(team_a, headers, n=1, cutoff=0.8)[0])
@@ -217,11 +622,11 @@ def execute_hard_swap(matrix, team_a, players_a, team_b, players_b):
 
     col_a = [row[idx_a] if idx_a < len(row) else "" for row in matrix]
     col_b = [row[idx_b] if idx_b < len(row) else "" for row in matrix]
-    mov_a = [p['name'] for p in players_a]; mov_b = [p['name'] for p in players_b]
+    mov_a = {p['name'] for p in players_a}; mov_b = {p['name'] for p in players_b}
 
     new_a = [col_a[0]] + [x for x in col_a[1:] if x not in mov_a and x != ""]
     new_b = [col_b[0]] + [x for x in col_b[1:] if x not in mov_b and x != ""]
-    new_a.extend(mov_b); new_b.extend(mov_a)
+    new_a.extend(p['name'] for p in players_b); new_b.extend(p['name'] for p in players_a)
 
     max_len = max(len(matrix), len(new_a), len(new_b))
     while len(matrix) < max_len: matrix.append([""] * len(matrix[0]))
@@ -238,243 +643,406 @@ def execute_hard_swap(matrix, team_a, players_a, team_b, players_b):
              if len(matrix[r]) > idx_b: matrix[r][idx_b] = ""
     return matrix, "Success"
 
-def cleanup_trade_block(sh, players_traded):
+def commit_hard_swap(repo, title, matrix, league, team_a, players_a, team_b, players_b):
+    """Apply a swap on the league model and write only the cells it changed in the two team columns."""
+    try: trade = league.apply_trade(team_a, [p['name'] for p in players_a], team_b, [p['name'] for p in players_b])
+    except KeyError as e: return None, f"Player not found: {e}"
+    new_matrix = patch_matrix(matrix, trade.cells)
+    cells = [(r, c, matrix[r - 1][c - 1] if r <= len(matrix) and c <= len(matrix[r - 1]) else "", new) for r, c, _, new in trade.cells]
+    try: n = repo.write_changes(title, ranges_from_cells(cells), new_matrix)
+    except SheetConflict as e: league.undo(trade); return None, str(e)
+    return new_matrix, f"Success ({n} ranges written)"
+
+def cleanup_trade_block(repo, players_traded, name_index=None):
     try:
-        block_ws = sh.worksheet("Trade Block")
-        all_values = block_ws.get_all_values()
+        all_values = repo.values("Trade Block")
         if not all_values: return "Block empty."
         headers = all_values[0]; data_rows = all_values[1:]
         rows_to_keep = []; removed = 0
+        traded = NameMatcher(players_traded)
         for row in data_rows:
             if len(row) < 2: continue
-            if difflib.get_close_matches(row[1], players_traded, n=1, cutoff=0.9): removed += 1
+            hit = name_index.lookup(row[1], cutoff=0.9, among=players_traded) if name_index else None
+            if hit or traded.best(row[1], cutoff=0.9): removed += 1
             else: rows_to_keep.append(row)
         if removed > 0:
-            block_ws.clear(); block_ws.update([headers] + rows_to_keep)
+            repo.apply_changes("Trade Block", all_values, [headers] + rows_to_keep)
             return f"Cleaned {removed} from Block."
         return "No matches found."
+    except SheetConflict as e: return str(e)
     except: return "Cleanup Error."
 
-def get_fuzzy_matches(input_names, team_players):
+@st.dialog("Confirm Trade")
+def verify_trade_dialog(team_a, players_a, team_b, players_b, matrix, league, name_index):
+    """Confirm a Terminal trade, then write the two roster columns, log it to History and clear the movers off the block."""
+    names_a, names_b = [p['name'] for p in players_a], [p['name'] for p in players_b]
+    st.markdown(f"**{team_a}** sends: {', '.join(names_a) or '—'}")
+    st.markdown(f"**{team_b}** sends: {', '.join(names_b) or '—'}")
+    if not st.button("✅ Execute Trade", type="primary"): return
+    repo = get_sheet_repo()
+    with st.spinner("Writing trade..."):
+        new_matrix, msg = commit_hard_swap(repo, repo.title_at(1), matrix, league, team_a, players_a, team_b, players_b)
+        if new_matrix is None: st.error(msg); return
+        repo.append_row(repo.title_at(0), [time.strftime("%Y-%m-%d"), team_a, ", ".join(names_a), team_b, ", ".join(names_b)])
+        block = cleanup_trade_block(repo, names_a + names_b, name_index)
+    st.success(f"{msg} · {block}"); time.sleep(1); st.rerun()
+
+def get_fuzzy_matches(input_names, team, name_index):
     results = []
-    if not team_players: return [None]
-    ledger_map = {p['name'].strip().lower(): p for p in team_players}
+    if not name_index or not name_index.roster(team): return [None]
     raw_list = [n.strip() for n in input_names.split(",") if n.strip()]
     for name in raw_list:
-        clean = name.strip().lower()
-        found = ledger_map.get(clean, {}).get('name')
-        if not found:
-            m = difflib.get_close_matches(clean, list(ledger_map.keys()), n=1, cutoff=0.5)
-            if m: found = ledger_map[m[0]]['name']
-        if not found and "." in clean:
-            fi, ls = clean.split(".")[0].strip(), clean.split(".")[1].strip()
-            for rn in ledger_map.keys():
-                if ls in rn and rn.startswith(fi): found = ledger_map[rn]['name']; break
-        if found: results.append(next((p for p in team_players if p['name'] == found), None))
+        found = name_index.lookup(name, team=team, cutoff=0.5)
+        if found: results.append(found)
         else: results.append({"name": f"❌ '{name}' Not Found", "row": -1})
     return results
 
-def organize_roster_ai(player_list):
+def position_key(name):
+    return make_key("position", normalize_name(name))
+
+async def classify_players_ai(names, sem):
+    """Hitter/Pitcher for players we have never seen; one Gemini call per team batch."""
     model = get_active_model()
-    prompt = f"Sort list into ['HITTERS:', ... 'PITCHERS:', ...]. List: {player_list}"
+    prompt = f"Classify each player as Hitter or Pitcher (two-way players count as Hitter). Return ONLY a JSON object mapping each name to \"Hitter\" or \"Pitcher\". Players: {json.dumps(names)}"
     try:
-        response = model.generate_content(prompt).text
-        match = re.search(r"(\[.*\])", response, re.DOTALL)
-        if match: return eval(match.group(1))
-        return None
-    except: return None
+        async with sem: response = await traced_generate("gemini.classify", model, prompt, players=len(names))
+        match = re.search(r"(\{.*\})", response, re.DOTALL)
+        data = json.loads(match.group(1)) if match else {}
+    except Exception: return {}
+    return {n: ("Pitcher" if str(data[n]).lower().startswith("p") else "Hitter") for n in names if n in data}
 
-def smart_correct_vision(vision_data, full_league_data):
+async def organize_league_async(league, teams, on_team=None):
+    """
+    Sorted ['HITTERS:', ..., 'PITCHERS:', ...] column per team.
+    Positions come from the persisted memo of model answers; players not in it go to the model. The sheet's
+    own section is only a fallback for a player the model did not answer, and is never persisted.
+    A team with any player still unclassified is left out rather than guessed.
+    """
+    cache = get_llm_cache(); known, hint, unseen = {}, {}, {}
+    for team in teams:
+        for p in league.get(team, []):
+            cat = cache.get(position_key(p.name))
+            if cat: known[p.name] = cat; continue
+            unseen.setdefault(team, []).append(p.name)
+            if p.category != "Unknown": hint[p.name] = p.category
+    sem = asyncio.Semaphore(ORGANIZER_CONCURRENCY)
+    for i, done in enumerate(asyncio.as_completed([classify_players_ai(n, sem) for n in unseen.values()])):
+        fresh = await done; known.update(fresh)
+        for name, cat in fresh.items(): cache.put(position_key(name), cat, task="Position")
+        if on_team: on_team(i + 1, len(unseen))
+    layouts = {}
+    for team in teams:
+        names = [p.name for p in league.get(team, [])]
+        cats = {n: known.get(n) or hint.get(n) for n in names}
+        if not names or not all(cats.values()): continue
+        layouts[team] = (["HITTERS:"] + [n for n in names if cats[n] == "Hitter"]
+                         + ["PITCHERS:"] + [n for n in names if cats[n] == "Pitcher"])
+    return layouts, len(unseen)
+
+def smart_correct_vision(vision_data, full_league_data, name_index):
     t_a, t_b = vision_data.get("team_a"), vision_data.get("team_b")
     if t_a not in full_league_data or t_b not in full_league_data: return vision_data
-    roster_a = [p['name'].lower().strip() for p in full_league_data[t_a]]
-    roster_b = [p['name'].lower().strip() for p in full_league_data[t_b]]
     final_a, final_b = [], []
     all_found = vision_data.get("players_a", []) + vision_data.get("players_b", [])
     for player in all_found:
-        p_clean = player.lower().strip()
-        if difflib.get_close_matches(p_clean, roster_a, n=1, cutoff=0.6): final_a.append(player)
-        elif difflib.get_close_matches(p_clean, roster_b, n=1, cutoff=0.6): final_b.append(player)
+        if name_index.lookup(player, team=t_a, cutoff=0.6): final_a.append(player)
+        elif name_index.lookup(player, team=t_b, cutoff=0.6): final_b.append(player)
         else:
             if player in vision_data.get("players_a", []): final_a.append(player)
             else: final_b.append(player)
     return {"team_a": t_a, "players_a": final_a, "team_b": t_b, "players_b": final_b}
 
 # --- 6. CACHED DATA LOADER & NEWS ---
-@st.cache_data(ttl=600)
 def load_league_data():
-    gc = get_gspread_client()
-    sh = gc.open_by_key(SHEET_ID)
-    raw = sh.get_worksheet(1).get_all_values()
-    data = parse_horizontal_rosters(raw)
-    try: intel = "\n".join([f"- {r[0]}: {r[1]}" for r in sh.worksheet("Intel").get_all_values()[1:] if len(r)>1])
-    except: intel = ""
-    return raw, data, intel
-
-@st.cache_data(ttl=1200) # Cache news for 20 mins
-def fetch_mlb_news():
-    try:
-        feed = feedparser.parse("https://www.mlb.com/feeds/news/rss.xml")
-        return [{"title": e.title, "link": e.link} for e in feed.entries[:5]]
-    except: return []
+    # one batch_get for rosters and intel; History/Trade Block are read through the local mirror
+    repo = get_sheet_repo()
+    roster_t = repo.title_at(1)
+    repo.prefetch([roster_t, "Intel"])
+    intel_rows = repo.values("Intel") if repo.has("Intel") else []
+    return build_league_snapshot(repo.generation(roster_t, "Intel"), repo.values(roster_t), intel_rows)
+
+@st.cache_data(ttl=600)
+def build_league_snapshot(generation, _raw, _intel_rows):
+    # keyed on the repository generation only, so unchanged sheets never re-parse
+    data = parse_horizontal_rosters(_raw)
+    intel = "\n".join([f"- {r[0]}: {r[1]}" for r in _intel_rows[1:] if len(r)>1])
+    return _raw, data, intel, PlayerNameIndex(data)
+
+def news_line(item, show_tags=True):
+    tags = ", ".join(p for p, _ in item["players"]) if show_tags else ""
+    return f"[{item['title']}]({item['link']})" + (f" · 🏷️ {tags}" if tags else "")
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+def mirror_view(sheet, key, filters=()):
+    """Search, filters, pager and chunked exports over a worksheet's local mirror. Returns (header, this page's rows)."""
+    mirror = get_sheet_mirror()
+    cols = st.columns([3] + [2] * len(filters) + [1])
+    q = cols[0].text_input("🔎 Search", key=f"{key}_q")
+    chosen = {f: cols[i + 1].multiselect(f, mirror.distinct(sheet, f), key=f"{key}_{f}") for i, f in enumerate(filters)}
+    total = mirror.count(sheet, q, chosen); pages = max(1, -(-total // PAGE_SIZE))
+    page = cols[-1].number_input("Page", 1, pages, 1, key=f"{key}_page_{make_key(q, chosen)}") # new search: back to page 1
+    st.caption(f"{total} rows · page {page} of {pages} · newest first")
+    stem = f"{sheet.replace(' ', '_')}_{time.strftime('%Y%m%d')}"
+    e1, e2, _ = st.columns([1, 1, 4])
+    e1.download_button("⬇️ CSV", lambda: mirror.export(sheet, "csv", q, chosen), f"{stem}.csv", "text/csv", key=f"{key}_csv", on_click="ignore")
+    e2.download_button("⬇️ Excel", lambda: mirror.export(sheet, "xlsx", q, chosen), f"{stem}.xlsx", XLSX_MIME, key=f"{key}_xlsx", on_click="ignore")
+    return mirror.meta(sheet)["header"], mirror.page(sheet, q, chosen, (page - 1) * PAGE_SIZE, PAGE_SIZE)
 
 # --- 7. MAIN APP UI ---
 st.set_page_config(page_title="GM Master Terminal", layout="wide", page_icon="⚡")
 st.title("⚡ Dynasty GM Suite: God Mode")
 
 try:
-    raw_matrix, full_league_data, intel_text = load_league_data()
-    gc_live = get_gspread_client()
-    sh_live = gc_live.open_by_key(SHEET_ID)
-    roster_ws_live = sh_live.get_worksheet(1)
-    history_ws_live = sh_live.get_worksheet(0)
+    get_tracer()
+    lazy_tabs = st.session_state.get("lazy_tabs", True)
+    health = warmup()
+    if any(ok is False for ok, _, _ in health_status(health).values()): warmup.clear() # retry failed handshakes next rerun
+    mark("warmup")
+    raw_matrix, full_league_data, intel_text, name_index = load_league_data()
+    mark("data")
+    sh_live = get_spreadsheet(); repo = get_sheet_repo()
+    roster_title, history_title = repo.title_at(1), repo.title_at(0)
     user_roster = full_league_data.get(USER_TEAM, [])
 
     # SIDEBAR: News Ticker & Tools
     with st.sidebar:
-        if st.button("🔄 Force Refresh"): st.cache_data.clear(); st.rerun()
+        if st.button("🔄 Force Refresh"): get_sheet_repo().invalidate(); get_sheet_mirror().expire(); st.cache_data.clear(); st.rerun()
+        st.toggle("💤 Load Tabs On Demand", value=True, key="lazy_tabs", help="Only the open tab runs and fetches its data.")
+        st.toggle("⚡ Bypass AI Cache", key="bypass_ai_cache")
+        if st.toggle("⏱️ Deadline Mode", key="deadline_mode"):
+            st.slider("Council budget (s)", 15, 120, COUNCIL_BUDGET, step=5, key="council_budget")
+            st.checkbox("Hedge slow members", value=True, key="hedge_requests")
+        cs = get_llm_cache().stats()
+        st.caption(f"AI cache: {cs['entries']} answers ({cs['bytes'] // 1024} KB), {cs['hits']} hits")
         st.divider()
         st.subheader("📰 MLB Wire")
-        news = fetch_mlb_news()
+        poller = get_news_poller(); poller.set_roster(name_index, repo.generation(roster_title)) # re-tags only when the roster changed
+        news = poller.store.latest(5) # local store only; feeds are polled in the background
         if news:
-            for n in news:
-                st.markdown(f"[{n['title']}]({n['link']})")
-        else: st.caption("No news feed.")
+            for n in news: st.markdown(news_line(n))
+        else: st.caption("No news yet (feeds are polling in the background).")
+        with st.expander("🗞️ News On My Players"):
+            nt = st.selectbox("Team:", TEAM_NAMES, index=TEAM_NAMES.index(USER_TEAM), key="news_team")
+            mine = poller.store.for_team(nt, 15)
+            for n in mine: st.markdown(f"{news_line(n, False)} · 🏷️ " + ", ".join(p for p, t in n["players"] if t == nt))
+            if not mine: st.caption("No recent news on this roster.")
+            ns = poller.store.stats()
+            st.caption(f"{ns['items']} stored · {ns['tagged']} tagged · polled " + (time.strftime('%H:%M', time.localtime(poller.last_poll)) if poller.last_poll else "—"))
+        st.divider()
+        with st.expander("🩺 System Health"):
+            status = health_status(health)
+            for step, (ok, secs, err) in status.items():
+                if ok is None: st.caption(f"⏳ {step} (warming up)")
+                else: st.caption(f"{'✅' if ok else '❌'} {step} ({secs}s){': ' + err if err else ''}")
+            boot = get_boot_stats(); last = st.session_state.get("last_run_marks")
+            if boot["cold"]: st.caption("Cold start: " + marks_line(boot["cold"]))
+            if last: st.caption("Last rerun: " + marks_line(last))
+            if boot["imports"]: st.caption("Deferred imports: " + " · ".join(f"{m} {ms}ms" for m, ms in boot["imports"].items()))
+            if status["Gemini"][0]:
+                reg = get_model_registry()
+                st.caption(f"Model: {reg.name}" + (f" · listed {time.strftime('%H:%M', time.localtime(reg.refreshed_at))}" if reg.refreshed_at else " · fallback"))
+        with st.expander("⏱️ Perf"):
+            perf = tracing.TRACER.summary(runs=PERF_RUNS if st.toggle(f"Last {PERF_RUNS} runs only", key="perf_runs_only") else None)
+            if perf:
+                st.dataframe(pd.DataFrame.from_dict(perf, orient="index").rename(columns={"p50": "p50 ms", "p95": "p95 ms", "cost": "cost $"}), use_container_width=True)
+                st.caption(f"Spans in {TRACE_FILE}")
+            else: st.caption("No spans yet.")
         st.divider()
         debug_team = st.selectbox("Inspect Team:", ["Select..."] + TEAM_NAMES)
         if debug_team != "Select...":
             r = full_league_data.get(debug_team, [])
             st.code("\n".join(sorted([p['name'] for p in r])))
 
-    tabs = st.tabs(["🔁 Terminal", "🔥 Analysis", "🔍 Finder", "🕵️ Intel", "📋 Block Monitor", "📊 Ledger", "🕵️‍♂️ Scouting", "💎 Sleepers", "🎯 Priority", "🎟️ Picks", "📜 History"])
+    mark("sidebar")
+    tabs = st.tabs(["🔁 Terminal", "🔥 Analysis", "🔍 Finder", "🕵️ Intel", "📋 Block Monitor", "📊 Ledger", "🕵️‍♂️ Scouting", "💎 Sleepers", "🎯 Priority", "🎟️ Picks", "📜 History"],
+                   key="main_tab", on_change="rerun" if lazy_tabs else "ignore")
+    def opened(tab):
+        return tab.open is not False # None when tabs are untracked (eager): every body runs
 
     with tabs[0]: # TERMINAL
-        st.subheader("Official Sync Terminal")
-        tm, tv = st.tabs(["Manual", "Vision"])
-        with tm:
-            c1, c2 = st.columns(2)
-            with c1: ta = st.selectbox("Team A:", TEAM_NAMES, key="m_ta"); pa = st.text_area("Giving:", key="m_pa")
-            with c2: tb = st.selectbox("Team B:", TEAM_NAMES, key="m_tb"); pb = st.text_area("Giving:", key="m_pb")
-            if st.button("Verify Manual"):
-                ma = get_fuzzy_matches(pa, full_league_data.get(ta)) if pa else []
-                mb = get_fuzzy_matches(pb, full_league_data.get(tb)) if pb else []
-                if any(x.get('row') == -1 for x in ma+mb): st.error("Check spelling.")
-                else: verify_trade_dialog(ta, ma, tb, mb, roster_ws_live, history_ws_live, raw_matrix, sh_live)
-        with tv:
-            up_img = st.file_uploader("Upload Trade Screenshot", type=["jpg","png"])
-            if up_img:
-                raw = parse_trade_screenshot(up_img, TEAM_NAMES)
-                if raw:
-                    d = smart_correct_vision(raw, full_league_data)
-                    c1, c2 = st.columns(2)
-                    with c1: ta_v = st.selectbox("Team A", TEAM_NAMES, index=TEAM_NAMES.index(d.get("team_a")) if d.get("team_a") in TEAM_NAMES else 0, key="vta"); pa_v = st.text_area("Players A", ", ".join(d.get("players_a", [])), key="vpa")
-                    with c2: tb_v = st.selectbox("Team B", TEAM_NAMES, index=TEAM_NAMES.index(d.get("team_b")) if d.get("team_b") in TEAM_NAMES else 0, key="vtb"); pb_v = st.text_area("Players B", ", ".join(d.get("players_b", [])), key="vpb")
-                    if st.button("Verify Vision"):
-                        ma = get_fuzzy_matches(pa_v, full_league_data.get(ta_v))
-                        mb = get_fuzzy_matches(pb_v, full_league_data.get(tb_v))
-                        if any(x.get('row') == -1 for x in ma+mb): st.error("Match failed.")
-                        else: verify_trade_dialog(ta_v, ma, tb_v, mb, roster_ws_live, history_ws_live, raw_matrix, sh_live)
+        if opened(tabs[0]):
+            st.subheader("Official Sync Terminal")
+            tm, tv = st.tabs(["Manual", "Vision"])
+            with tm:
+                c1, c2 = st.columns(2)
+                with c1: ta = st.selectbox("Team A:", TEAM_NAMES, key="m_ta"); pa = st.text_area("Giving:", key="m_pa")
+                with c2: tb = st.selectbox("Team B:", TEAM_NAMES, key="m_tb"); pb = st.text_area("Giving:", key="m_pb")
+                if st.button("Verify Manual"):
+                    ma = get_fuzzy_matches(pa, ta, name_index) if pa else []
+                    mb = get_fuzzy_matches(pb, tb, name_index) if pb else []
+                    if any(x.get('row') == -1 for x in ma+mb): st.error("Check spelling.")
+                    else: verify_trade_dialog(ta, ma, tb, mb, raw_matrix, full_league_data, name_index)
+            with tv:
+                up_img = st.file_uploader("Upload Trade Screenshot", type=["jpg","png"])
+                if up_img:
+                    raw = parse_trade_screenshot(up_img, TEAM_NAMES)
+                    if raw:
+                        d = smart_correct_vision(raw, full_league_data, name_index)
+                        c1, c2 = st.columns(2)
+                        with c1: ta_v = st.selectbox("Team A", TEAM_NAMES, index=TEAM_NAMES.index(d.get("team_a")) if d.get("team_a") in TEAM_NAMES else 0, key="vta"); pa_v = st.text_area("Players A", ", ".join(d.get("players_a", [])), key="vpa")
+                        with c2: tb_v = st.selectbox("Team B", TEAM_NAMES, index=TEAM_NAMES.index(d.get("team_b")) if d.get("team_b") in TEAM_NAMES else 0, key="vtb"); pb_v = st.text_area("Players B", ", ".join(d.get("players_b", [])), key="vpb")
+                        if st.button("Verify Vision"):
+                            ma = get_fuzzy_matches(pa_v, ta_v, name_index)
+                            mb = get_fuzzy_matches(pb_v, tb_v, name_index)
+                            if any(x.get('row') == -1 for x in ma+mb): st.error("Match failed.")
+                            else: verify_trade_dialog(ta_v, ma, tb_v, mb, raw_matrix, full_league_data, name_index)
 
     with tabs[1]: # ANALYSIS (THE VISUAL UPGRADE)
-        st.subheader("📊 Deep Trade Analytics")
-        st.info("💡 Projections: 2026 ZiPS (3-Year Window) | Valuations: Fangraphs Auction Logic")
-        q = st.chat_input("Analyze trade scenario...")
-        if q:
-            res = run_fast_analysis(q, json.dumps(full_league_data), intel_text, "Trade")
-            st.write(res["Research"])
+        if opened(tabs[1]):
+            st.subheader("📊 Deep Trade Analytics")
+            st.info("💡 Projections: 2026 ZiPS (3-Year Window) | Valuations: Fangraphs Auction Logic")
+            q = st.chat_input("Analyze trade scenario...")
+            if q:
+                submit_analysis("trade", q, roster_context(q, full_league_data, name_index), intel_text, "Trade")
+                st.session_state["trade_impact"] = trade_impact(q, full_league_data, name_index)
+
+            def render_trade(res, done):
+                st.markdown(res.get("Research", ""))
             
-            # Visual Comparison Columns
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("### 🏛️ The Verdict")
-                st.write(res["Gemini"])
-            with col2:
-                st.markdown("### ♟️ Strategic Outlook")
-                st.write(res["Claude"])
+                # Visual Comparison Columns (panels fill in as each model streams)
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("### 🏛️ The Verdict")
+                    st.markdown(res.get("Gemini", "…"))
+                    if done: st.caption(timing_caption(res["Timing"], "Gemini"))
+                with col2:
+                    st.markdown("### ♟️ Strategic Outlook")
+                    st.markdown(res.get("Claude", "…"))
+                    if done: st.caption(timing_caption(res["Timing"], "Claude"))
+                if not done: return
+                st.caption(f"Brief: ~{res['Tokens']} tokens · " + timing_caption(res["Timing"], "Research"))
+                st.caption(council_status_line(res["Council"]))
             
-            # Visual Trade Simulator (Dummy data visualization for impact)
-            st.markdown("### 📈 Projected Impact (3-Year WAR)")
-            chart_data = pd.DataFrame({
-                "Category": ["Batting", "Pitching", "Prospects"],
-                "Current": [50, 40, 60],
-                "Post-Trade": [55, 38, 70]
-            })
-            st.bar_chart(chart_data.set_index("Category"), color=["#FF4B4B", "#00FF00"])
+                # Visual Trade Simulator (category strength from the local projections)
+                st.markdown("### 📈 Projected Impact (Category Strength)")
+                impact = st.session_state.get("trade_impact")
+                if impact:
+                    st.caption(f"{impact[0]}: summed z-scores per category, before and after the trade")
+                    st.bar_chart(impact[1], color=["#FF4B4B", "#00FF00"])
+                else: st.caption(f"Add {PROJECTIONS_FILE} and name rostered players to see the projected impact.")
+            show_job("trade", render_trade)
 
     with tabs[2]: # FINDER (EXPANDED)
-        c1, c2 = st.columns(2)
-        with c1: t = st.selectbox("Target:", ["Elite Prospects (Top 100)", "MLB-Ready Youth (<24yo)", "Win-Now Veterans", "Buy-Low Candidates", "2026 SP Help"])
-        with c2: o = st.text_input("Offer:")
-        if st.button("Scour League"): st.write(run_fast_analysis(f"Find trades to get {t} for {o}. Use Dynasty Rankings.", json.dumps(full_league_data), intel_text, "Finder")["Gemini"])
+        if opened(tabs[2]):
+            c1, c2 = st.columns(2)
+            with c1: t = st.selectbox("Target:", list(FINDER_TARGETS))
+            with c2: o = st.text_input("Offer:")
+            if st.button("Scour League"):
+                engine = valuation_engine(full_league_data)
+                if engine is None:
+                    st.session_state["finder_candidates"] = None
+                    fq = f"Find trades to get {t} for {o}. Use Dynasty Rankings."
+                else:
+                    cands = st.session_state["finder_candidates"] = scour_league(engine, t, o, name_index)
+                    fq = candidates_brief(cands, t) if len(cands) else None
+                if fq: submit_analysis("finder", fq, roster_context(fq, full_league_data, name_index), intel_text, "Finder")
+                else: st.warning("No feasible trades for that target and offer under current projections.")
+            cands = st.session_state.get("finder_candidates")
+            if cands is not None and len(cands):
+                st.caption(f"Pre-screened locally from {PROJECTIONS_FILE}; the council weighs in on these {len(cands)}.")
+                st.dataframe(cands, use_container_width=True, hide_index=True)
+            show_job("finder", lambda r, done: st.write(r.get("Gemini", "…")))
 
     with tabs[3]: # INTEL
-        st.subheader("🕵️ League Intel")
-        st.markdown(intel_text if intel_text else "No active rumors.")
-        with st.form("new_intel"):
-            r = st.text_input("Rumor:"); s = st.selectbox("Source:", ["High", "Med", "Low"])
-            if st.form_submit_button("Save"):
-                try: ws = sh_live.worksheet("Intel")
-                except: ws = sh_live.add_worksheet("Intel", 1000, 5); ws.append_row(["Date","Rumor","Source"])
-                ws.append_row([time.strftime("%Y-%m-%d"), r, s]); st.cache_data.clear(); st.success("Saved!"); time.sleep(1); st.rerun()
+        if opened(tabs[3]):
+            st.subheader("🕵️ League Intel")
+            st.markdown(intel_text if intel_text else "No active rumors.")
+            with st.form("new_intel"):
+                r = st.text_input("Rumor:"); s = st.selectbox("Source:", ["High", "Med", "Low"])
+                if st.form_submit_button("Save"):
+                    repo.ensure_worksheet("Intel", 1000, 5, ["Date","Rumor","Source"])
+                    repo.append_row("Intel", [time.strftime("%Y-%m-%d"), r, s]); st.success("Saved!"); time.sleep(1); st.rerun()
 
     with tabs[4]: # BLOCK MONITOR
-        st.subheader("📋 Living Trade Block")
-        with st.expander("⚠️ Repair Database"):
-            if st.button("🧨 Factory Reset"):
-                try: sh_live.del_worksheet(sh_live.worksheet("Trade Block"))
-                except: pass
-                ws = sh_live.add_worksheet("Trade Block", 1000, 20); ws.append_row(["Team","Player","Position","Grade","Verdict","Impact %","Outlook Shift","Analysis","Timestamp"])
-                st.success("Reset!"); time.sleep(1); st.rerun()
+        if opened(tabs[4]):
+            st.subheader("📋 Living Trade Block")
+            with st.expander("⚠️ Repair Database"):
+                if st.button("🧨 Factory Reset"):
+                    try: repo.del_worksheet("Trade Block")
+                    except: pass
+                    repo.add_worksheet("Trade Block", 1000, 20, BLOCK_HEADER)
+                    st.success("Reset!"); time.sleep(1); st.rerun()
         
-        try: st.dataframe(pd.DataFrame(sh_live.worksheet("Trade Block").get_all_records()), use_container_width=True)
-        except: st.warning("Empty.")
+            try:
+                get_sheet_mirror().sync(repo, "Trade Block", header=True)
+                header, rows = mirror_view("Trade Block", "block", filters=("Team", "Verdict"))
+                st.dataframe(pd.DataFrame([(r + [""] * len(header))[:len(header)] for r in rows], columns=header), use_container_width=True, hide_index=True)
+            except: st.warning("Empty.")
         
-        up_files = st.file_uploader("Upload Block Screenshots", type=["jpg","png"], accept_multiple_files=True)
-        if up_files and st.button("Deep Scout & Save"):
-            if analyze_and_save_block_deep(up_files, json.dumps(user_roster), intel_text, sh_live):
-                st.success("Saved!"); time.sleep(2); st.rerun()
+            up_files = st.file_uploader("Upload Block Screenshots", type=["jpg","png"], accept_multiple_files=True)
+            if up_files and st.button("Deep Scout & Save"):
+                if analyze_and_save_block_deep(up_files, format_team(USER_TEAM, user_roster), intel_text, repo, name_index):
+                    st.success("Saved!"); time.sleep(2); st.rerun()
 
     with tabs[5]: # LEDGER
-        st.subheader("📊 Roster Matrix")
-        if full_league_data:
-            df = flatten_roster_to_df(full_league_data)
-            c1, c2 = st.columns(2)
-            ft = c1.multiselect("Filter Team:", TEAM_NAMES)
-            fc = c2.multiselect("Filter Pos:", ["Hitter", "Pitcher"])
-            if ft: df = df[df["Team"].isin(ft)]
-            if fc: df = df[df["Category"].isin(fc)]
-            st.dataframe(df, use_container_width=True, hide_index=True)
-        with st.expander("⚙️ Bulk Organizer"):
-            if st.button("🚀 Organize ENTIRE League"):
-                h = [str(c).strip() for c in raw_matrix[0]]
-                prog = st.progress(0); valid = [(i, x) for i, x in enumerate(h) if x in TEAM_NAMES]
-                for i, (idx, team) in enumerate(valid):
-                    curr = [r[idx] for r in raw_matrix[1:] if idx < len(r) and r[idx].strip()]
-                    s = organize_roster_ai(curr)
-                    if s:
-                        for r in range(1, len(raw_matrix)):
-                            if idx < len(raw_matrix[r]): raw_matrix[r][idx] = ""
-                        while len(raw_matrix) < len(s)+1: raw_matrix.append([""]*len(raw_matrix[0]))
-                        for k, v in enumerate(s): raw_matrix[k+1][idx] = v
-                    prog.progress((i+1)/len(valid))
-                roster_ws_live.clear(); roster_ws_live.update(raw_matrix); st.cache_data.clear(); st.success("Done!"); time.sleep(2); st.rerun()
+        if opened(tabs[5]):
+            st.subheader("📊 Roster Matrix")
+            if full_league_data:
+                df = flatten_roster_to_df(full_league_data)
+                c1, c2 = st.columns(2)
+                ft = c1.multiselect("Filter Team:", TEAM_NAMES)
+                fc = c2.multiselect("Filter Pos:", ["Hitter", "Pitcher"])
+                if ft: df = df[df["Team"].isin(ft)]
+                if fc: df = df[df["Category"].isin(fc)]
+                st.dataframe(df, use_container_width=True, hide_index=True)
+            with st.expander("⚙️ Bulk Organizer"):
+                if st.button("🚀 Organize ENTIRE League"):
+                    before = [list(r) for r in raw_matrix]
+                    h = [str(c).strip() for c in raw_matrix[0]]
+                    prog = st.progress(0); valid = [(i, x) for i, x in enumerate(h) if x in TEAM_NAMES]
+                    with tracing.run("organizer"):
+                        layouts, calls = asyncio.run(organize_league_async(full_league_data, [t for _, t in valid], lambda k, n: prog.progress(k / n)))
+                    for idx, team in valid:
+                        s = layouts.get(team)
+                        if s:
+                            for r in range(1, len(raw_matrix)):
+                                if idx < len(raw_matrix[r]): raw_matrix[r][idx] = ""
+                            while len(raw_matrix) < len(s)+1: raw_matrix.append([""]*len(raw_matrix[0]))
+                            for k, v in enumerate(s): raw_matrix[k+1][idx] = v
+                    prog.progress(1.0)
+                    skipped = [t for _, t in valid if full_league_data.get(t) and t not in layouts]
+                    if skipped: st.warning(f"Left unsorted (players the model could not classify): {', '.join(skipped)}")
+                    try: n = repo.apply_changes(roster_title, before, raw_matrix)
+                    except SheetConflict as e: st.error(str(e)); st.stop()
+                    st.success(f"Done! ({calls} model calls, {n} ranges updated)"); time.sleep(2); st.rerun()
 
     with tabs[6]: # SCOUTING
-        s = st.text_input("Player:")
-        if s: 
-            r = run_fast_analysis(f"Scout {s}", json.dumps(full_league_data), intel_text, "Scout")
-            c1, c2 = st.columns(2); c1.write(r["Gemini"]); c2.write(r["GPT"])
+        if opened(tabs[6]):
+            s = st.text_input("Player:")
+            if s: submit_analysis("scout", f"Scout {s}", roster_context(s, full_league_data, name_index), intel_text, "Scout")
+            def render_scout(r, done):
+                c1, c2 = st.columns(2); c1.markdown(r.get("Gemini", "…")); c2.markdown(r.get("GPT", "…"))
+                if done:
+                    c1.caption(timing_caption(r["Timing"], "Gemini")); c2.caption(timing_caption(r["Timing"], "GPT"))
+                    st.caption(council_status_line(r["Council"]))
+            show_job("scout", render_scout)
 
     with tabs[7]: # SLEEPERS
-        if st.button("Find Sleepers"): st.write(run_fast_analysis("Find 5 dynasty sleepers", json.dumps(full_league_data), intel_text, "Sleepers")["Gemini"])
+        if opened(tabs[7]):
+            if st.button("Find Sleepers"): submit_analysis("sleepers", "Find 5 dynasty sleepers", roster_context("", full_league_data, name_index), intel_text, "Sleepers")
+            show_job("sleepers", lambda r, done: st.write(r.get("Gemini", "…")))
 
     with tabs[8]: # PRIORITY
-        if st.button("Targets"): st.write(run_fast_analysis("Top 5 trade targets", json.dumps(full_league_data), intel_text, "Targets")["Gemini"])
+        if opened(tabs[8]):
+            if st.button("Targets"): submit_analysis("targets", "Top 5 trade targets", roster_context("", full_league_data, name_index), intel_text, "Targets")
+            show_job("targets", lambda r, done: st.write(r.get("Gemini", "…")))
 
     with tabs[9]: # PICKS
-        if st.button("2026 Class"): st.write(run_fast_analysis("Analyze 2026 Draft", "N/A", intel_text, "Draft")["Gemini"])
+        if opened(tabs[9]):
+            if st.button("2026 Class"): submit_analysis("draft", "Analyze 2026 Draft", "N/A", intel_text, "Draft")
+            show_job("draft", lambda r, done: st.write(r.get("Gemini", "…")))
 
     with tabs[10]: # HISTORY
-        for l in history_ws_live.col_values(1)[::-1]: st.write(f"🔹 {l}")
+        if opened(tabs[10]):
+            get_sheet_mirror().sync(repo, history_title)
+            _, rows = mirror_view(history_title, "history")
+            for r in rows: st.write("🔹 " + " · ".join(c for c in r if c))
+
+    mark("tabs")
+    boot = get_boot_stats()
+    if boot["cold"] is None: boot["cold"] = dict(RUN_MARKS)
+    st.session_state["last_run_marks"] = dict(RUN_MARKS)
+    tracing.TRACER.record({"phase": "app.rerun", "run": None, "ts": round(time.time(), 3), "ms": float(RUN_MARKS["tabs"])})
 
 except Exception as e: st.error(f"Error: {e}")
@@ -0,0 +1,91 @@
+"""Roster parsing and trade application: legacy dict-of-lists vs LeagueModel.
+
+    python benchmarks/bench_league_model.py [--teams 10 30] [--roster 40 60] [--repeat 20]
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_name_index import synthetic_league  # noqa: E402
+from league_model import LeagueModel, patch_matrix  # noqa: E402
+from name_index import NameMatcher  # noqa: E402
+
+def league_matrix(n_teams, roster_size):
+    league = synthetic_league(n_teams, roster_size); teams = list(league)
+    split = roster_size * 2 // 3
+    cols = []
+    for t in teams:
+        names = [p["name"] for p in league[t]]
+        cols.append([t, "HITTERS:"] + names[:split] + ["PITCHERS:"] + names[split:])
+    height = max(len(c) for c in cols)
+    return teams, [[c[r] if r < len(c) else "" for c in cols] for r in range(height)]
+
+def legacy_parse(matrix, team_names):
+    league_map = {t: [] for t in team_names}
+    headers = [str(c).strip() for c in matrix[0]]
+    for col_idx, header_val in enumerate(headers):
+        match = difflib.get_close_matches(header_val, team_names, n=1, cutoff=0.9)
+        if match:
+            for row_idx, row in enumerate(matrix[1:]):
+                if col_idx < len(row):
+                    val = str(row[col_idx]).strip()
+                    if val and not val.endswith(':'):
+                        league_map[match[0]].append({"name": val, "row": row_idx + 2, "col": col_idx + 1})
+    return league_map
+
+def legacy_swap(matrix, team_a, players_a, team_b, players_b):
+    """The pre-LeagueModel execute_hard_swap: rebuild both columns with list membership tests."""
+    matrix = [list(r) for r in matrix]
+    headers = [str(c).strip() for c in matrix[0]]
+    idx_a = headers.index(difflib.get_close_matches(team_a, headers, n=1, cutoff=0.8)[0])
+    idx_b = headers.index(difflib.get_close_matches(team_b, headers, n=1, cutoff=0.8)[0])
+    col_a = [row[idx_a] if idx_a < len(row) else "" for row in matrix]
+    col_b = [row[idx_b] if idx_b < len(row) else "" for row in matrix]
+    mov_a = [p['name'] for p in players_a]; mov_b = [p['name'] for p in players_b]
+    new_a = [col_a[0]] + [x for x in col_a[1:] if x not in mov_a and x != ""]
+    new_b = [col_b[0]] + [x for x in col_b[1:] if x not in mov_b and x != ""]
+    new_a.extend(mov_b); new_b.extend(mov_a)
+    max_len = max(len(matrix), len(new_a), len(new_b))
+    while len(matrix) < max_len: matrix.append([""] * len(matrix[0]))
+    for r in range(max_len):
+        for idx, new in ((idx_a, new_a), (idx_b, new_b)):
+            while len(matrix[r]) <= idx: matrix[r].append("")
+            matrix[r][idx] = new[r] if r < len(new) else ""
+    return matrix
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+def run(team_counts, roster_sizes, repeat):
+    print(f"{'teams':>5} {'roster':>6} | {'parse ms (old/new)':>20} | {'swap ms (old/new)':>20} | cells written (old/new)")
+    for n in team_counts:
+        for size in roster_sizes:
+            teams, matrix = league_matrix(n, size); matcher = NameMatcher(teams); rng = random.Random(n * size)
+            p_old = best_of(lambda: legacy_parse(matrix, teams), repeat)
+            p_new = best_of(lambda: LeagueModel.from_matrix(matrix, matcher, teams), repeat)
+            league = LeagueModel.from_matrix(matrix, matcher, teams)
+            ta, tb = rng.sample(teams, 2)
+            give = [{"name": p.name} for p in rng.sample(league[ta], 2)]; get = [{"name": p.name} for p in rng.sample(league[tb], 1)]
+            s_old = best_of(lambda: legacy_swap(matrix, ta, give, tb, get), repeat)
+            def new_swap():
+                trade = league.apply_trade(ta, [g["name"] for g in give], tb, [g["name"] for g in get])
+                patch_matrix(matrix, trade.cells); league.undo(trade)
+            s_new = best_of(new_swap, repeat)
+            old_cells = sum(a != b for r0, r1 in zip(matrix, legacy_swap(matrix, ta, give, tb, get)) for a, b in zip(r0, r1))
+            trade = league.apply_trade(ta, [g["name"] for g in give], tb, [g["name"] for g in get]); league.undo(trade)
+            print(f"{n:>5} {size:>6} | {p_old:>9.2f} / {p_new:>8.2f} | {s_old:>9.3f} / {s_new:>8.3f} | {old_cells} / {len(trade.cells)}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--teams", type=int, nargs="+", default=[10, 30])
+    ap.add_argument("--roster", type=int, nargs="+", default=[40, 60])
+    ap.add_argument("--repeat", type=int, default=20)
+    a = ap.parse_args()
+    run(a.teams, a.roster, a.repeat)
@@ -0,0 +1,84 @@
+"""Name matching latency: per-call difflib scans vs the shared PlayerNameIndex.
+
+    python benchmarks/bench_name_index.py [--teams 10 30 60 100] [--roster 40] [--queries 500]
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from name_index import PlayerNameIndex  # noqa: E402
+
+FIRST = ["Zach", "Bobby", "Ronald", "Julio", "Gunnar", "Corbin", "Jackson", "Paul", "Spencer", "Elly",
+         "Wyatt", "Jordan", "Junior", "Marcelo", "Cal", "Adley", "Logan", "Tarik", "Shohei", "Yoshinobu"]
+LAST = ["Neto", "Witt", "Acuna", "Rodriguez", "Henderson", "Carroll", "Holliday", "Skenes", "Strider",
+        "De La Cruz", "Langford", "Walker", "Caminero", "Mayer", "Raleigh", "Rutschman", "Gilbert",
+        "Skubal", "Ohtani", "Yamamoto", "Chourio", "Merrill", "Crews", "Lawlar", "Basallo", "Jones"]
+
+def synthetic_league(n_teams, roster_size, seed=7):
+    rng = random.Random(seed); seen = set(); league = {}
+    for t in range(n_teams):
+        team = f"Team {t + 1}"; league[team] = []
+        while len(league[team]) < roster_size:
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+            if name in seen: name = f"{name} {rng.choice('ABCDEFGHJK')}{len(seen)}"
+            seen.add(name)
+            league[team].append({"name": name, "row": len(league[team]) + 2, "col": t + 1})
+    return league
+
+def typo(name, rng):
+    mode = rng.random()
+    if mode < 0.3: return name.lower()
+    if mode < 0.6:
+        i = rng.randrange(len(name)); return name[:i] + name[i + 1:]
+    if mode < 0.8:
+        first, _, rest = name.partition(" "); return f"{first[0]}. {rest}"
+    return name.upper()
+
+def legacy_match(name, team_players, cutoff=0.5):
+    """Mirror of the old get_fuzzy_matches per-name work."""
+    ledger_map = {p['name'].strip().lower(): p for p in team_players}
+    clean = name.strip().lower()
+    found = ledger_map.get(clean, {}).get('name')
+    if not found:
+        m = difflib.get_close_matches(clean, list(ledger_map.keys()), n=1, cutoff=cutoff)
+        if m: found = ledger_map[m[0]]['name']
+    if not found and "." in clean:
+        fi, ls = clean.split(".")[0].strip(), clean.split(".")[1].strip()
+        for rn in ledger_map.keys():
+            if ls in rn and rn.startswith(fi): found = ledger_map[rn]['name']; break
+    return next((p for p in team_players if p['name'] == found), None) if found else None
+
+def legacy_league_match(name, league, cutoff=0.6):
+    everyone = [p['name'].lower().strip() for roster in league.values() for p in roster]
+    return difflib.get_close_matches(name.lower().strip(), everyone, n=1, cutoff=cutoff)
+
+def timed(fn, items):
+    t0 = time.perf_counter(); hits = sum(1 for x in items if fn(x))
+    return (time.perf_counter() - t0) / max(len(items), 1) * 1e6, hits
+
+def run(teams, roster, n_queries):
+    print(f"{'teams':>5} {'players':>7} {'build ms':>9} | {'team us (old/new)':>19} | {'league us (old/new)':>21} | hits old/new")
+    for n in teams:
+        league = synthetic_league(n, roster); rng = random.Random(n)
+        t0 = time.perf_counter(); idx = PlayerNameIndex(league); build = (time.perf_counter() - t0) * 1e3
+        qs = []
+        for _ in range(n_queries):
+            team = rng.choice(list(league)); qs.append((team, typo(rng.choice(league[team])["name"], rng)))
+        old_t, old_h = timed(lambda q: legacy_match(q[1], league[q[0]]), qs)
+        new_t, new_h = timed(lambda q: idx.lookup(q[1], team=q[0], cutoff=0.5), qs)
+        lq = qs[:max(n_queries // 10, 20)]
+        old_l, _ = timed(lambda q: legacy_league_match(q[1], league), lq)
+        new_l, _ = timed(lambda q: idx.lookup(q[1], cutoff=0.6), lq)
+        print(f"{n:>5} {len(idx):>7} {build:>9.1f} | {old_t:>8.1f} / {new_t:>8.1f} | {old_l:>9.1f} / {new_l:>9.1f} | {old_h}/{new_h}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--teams", type=int, nargs="+", default=[10, 30, 60, 100])
+    ap.add_argument("--roster", type=int, default=40)
+    ap.add_argument("--queries", type=int, default=500)
+    a = ap.parse_args()
+    run(a.teams, a.roster, a.queries)
@@ -0,0 +1,214 @@
+"""End-to-end pipeline benchmarks against local stand-ins: no API keys, no network.
+
+    python benchmarks/bench_pipeline.py [--teams 10 30 50] [--roster 40] [--repeat 5] [--concurrency 4]
+        [--or-latency 0.08] [--gemini-latency 0.08] [--sheets-latency 0.01] [--error-rate 0.0]
+        [--baseline benchmarks/baseline.json] [--save-baseline] [--tolerance 0.25]
+
+app.py is imported in Streamlit bare mode (the UI renders nothing and stops at
+the missing secrets), then its resource getters are pointed at the stand-ins in
+fakes.py, so the real code runs end to end: OpenRouterClient against a local
+HTTP server, SheetRepository against an in-memory spreadsheet, and the trade
+valuation engine against random projections for every rostered player; the
+History mirror syncs and pages from a local SQLite file.
+
+Prints min/p50/p95 latency and throughput per scenario and league size, then
+a per-phase breakdown from the tracing spans. A scenario is flagged, and the
+exit status is 1, when its best run (min of --repeat) is slower than the
+stored baseline's by more than the tolerance and by at least MIN_DELTA_MS, and
+stays so after CONFIRM x --repeat more runs. Scenarios that mostly time the
+fake model latency are reported but not gated.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE)); sys.path.insert(0, HERE)
+from bench_league_model import league_matrix  # noqa: E402
+from fakes import FakeGeminiModel, FakeOpenRouter, FakeSpreadsheet  # noqa: E402
+
+BASELINE = os.path.join(HERE, "baseline.json")
+MIN_DELTA_MS = 5.0  # smaller swings are scheduler/GC noise on millisecond scenarios, never a regression
+CONFIRM = 3  # a suspected regression is re-timed with this many times --repeat more runs before it counts
+INFORMATIONAL = ("async_run_deep_analysis", "deep_analysis x", "process_block_images_async")  # dominated by fake latency
+
+def import_app(workdir):
+    """Import app.py quietly; its on-disk caches and trace land in `workdir`."""
+    import streamlit.config
+    import streamlit.logger
+    streamlit.config.get_config_options()  # parse config now; doing so later resets log levels
+    streamlit.logger.set_log_level("error")  # bare mode warns on every UI call
+    os.chdir(workdir)
+    import app
+    return app
+
+def league_sheets(n_teams, roster_size):
+    teams, matrix = league_matrix(n_teams, roster_size)
+    history = [[f"Trade {i}: {teams[i % n_teams]} <> {teams[(i + 1) % n_teams]}"] for i in range(200)]
+    intel = [["Date", "Rumor", "Source"]] + [["2026-01-01", f"{t} shopping arms", "Med"] for t in teams]
+    return teams, matrix, {"History": history, "Rosters": matrix, "Intel": intel, "Trade Block": [["Team", "Player"]]}
+
+def screenshots(k):
+    from PIL import Image
+    out = []
+    for i in range(k):
+        buf = BytesIO(); Image.new("RGB", (1400, 900), (20 * i % 255, 80, 120)).save(buf, "PNG"); out.append(buf)
+    return out
+
+def write_projections(players, path, seed=7):
+    """Random projections for every rostered player, in the columns valuation.py scores."""
+    import numpy as np
+    import pandas as pd
+    from valuation import CATEGORIES
+    rng = np.random.default_rng(seed)
+    cols = {c: rng.normal(50, 10, len(players)) for c in CATEGORIES}
+    pd.DataFrame({"Player": players, **cols, "Age": rng.integers(19, 37, len(players))}).to_csv(path, index=False)
+
+def timed(fn, repeat, setup=None):
+    secs = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        t0 = time.perf_counter(); fn(state); secs.append(time.perf_counter() - t0)
+    return secs
+
+def stats(secs, ops=1):
+    s = sorted(secs)
+    return {"n": len(s), "min_ms": round(s[0] * 1e3, 2), "p50_ms": round(statistics.median(s) * 1e3, 2),
+            "p95_ms": round(s[min(int(len(s) * 0.95), len(s) - 1)] * 1e3, 2),
+            "ops_s": round(ops * len(s) / sum(s), 2) if sum(s) else None}
+
+def regressed(r, base, tolerance):
+    if not base or not r.get("gated", True): return False
+    old = base.get("min_ms", base["p50_ms"])
+    return r["min_ms"] > old * (1 + tolerance) and r["min_ms"] - old >= MIN_DELTA_MS
+
+def run(a, baseline=None):
+    work = tempfile.mkdtemp(prefix="gm-bench-")
+    app = import_app(work)
+    import tracing
+    from council import LatencyStats
+    from llm_cache import LLMCache
+    from name_index import NameMatcher
+    from openrouter_client import OpenRouterClient
+    from sheet_repo import SheetRepository
+
+    server = FakeOpenRouter(latency=a.or_latency, error_rate=a.error_rate)
+    client = OpenRouterClient("bench-key", url=server.url, max_retries=3)
+    cache = LLMCache(os.path.join(work, "llm_cache.sqlite"))
+    tracing.configure(os.path.join(work, "trace.jsonl"))
+    state = {}
+    app.get_openrouter_client = lambda: client
+    app.get_llm_cache = lambda: cache
+    app.get_latency_stats = lambda: LatencyStats()
+    app.get_sheet_repo = lambda: state["repo"]
+    app.get_active_model = lambda: state["model"]
+    noop = lambda *args: None  # noqa: E731
+
+    results = {}
+    print(f"{'scenario':<34} {'teams':>5} | {'min ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>8}")
+    for n in a.teams:
+        teams, matrix, sheets = league_sheets(n, a.roster)
+        app.TEAM_NAMES, app.TEAM_MATCHER, app.USER_TEAM = teams, NameMatcher(teams), teams[0]
+        state["model"] = FakeGeminiModel([c for row in matrix[1:] for c in row if c and not c.endswith(":")], latency=a.gemini_latency)
+
+        def fresh_repo():
+            state["repo"] = SheetRepository(FakeSpreadsheet(sheets, latency=a.sheets_latency))
+
+        def cold_load(_):
+            app.build_league_snapshot.clear(); app.load_league_data()
+
+        fresh_repo(); _, league, intel, name_index = app.load_league_data()
+        ta, tb = teams[0], teams[1]
+        give = [{"name": p.name} for p in league[ta][:2]]; get = [{"name": league[tb][0].name}]
+        query = f"Trade {give[0]['name']} and {give[1]['name']} for {get[0]['name']}"
+        ctx = app.roster_context(query, league, name_index)
+        roster_text = app.format_team(ta, league[ta])
+        panels = {m: noop for m in ("Research", "Gemini", "GPT", "Claude")}
+
+        def swap_setup():
+            fresh_repo(); raw = state["repo"].values("Rosters")
+            return raw, app.parse_horizontal_rosters(raw)
+
+        def analysis(_):
+            return asyncio.run(app.async_run_deep_analysis(query, ctx, intel, "Trade", True, panels, report=noop))
+
+        async def many():
+            return await asyncio.gather(*[app.async_run_deep_analysis(f"{query} #{i}", ctx, intel, "Trade", True, panels, report=noop)
+                                          for i in range(a.concurrency)])
+
+        shots = screenshots(a.screenshots)
+        write_projections(app.flatten_roster_to_df(league)["Player"], app.PROJECTIONS_FILE)
+
+        def build_engine(_):
+            app.get_valuation_engine.clear(); return app.valuation_engine(league)
+
+        engine = build_engine(None)
+        mirror = app.get_sheet_mirror(); mirror.sync(state["repo"], "History", force=True)
+        scenarios = [
+            ("load_league_data (cold)", cold_load, fresh_repo, 1),
+            ("load_league_data (warm)", lambda _: app.load_league_data(), None, 1),
+            ("parse_horizontal_rosters", lambda _: app.parse_horizontal_rosters(matrix), None, 1),
+            ("execute_hard_swap", lambda _: app.execute_hard_swap(matrix, ta, give, tb, get), None, 1),
+            ("commit_hard_swap", lambda s: app.commit_hard_swap(state["repo"], "Rosters", s[0], s[1], ta, give, tb, get), swap_setup, 1),
+            ("async_run_deep_analysis", analysis, None, 1),
+            (f"deep_analysis x{a.concurrency} concurrent", lambda _: asyncio.run(many()), None, a.concurrency),
+            ("valuation_engine (build)", build_engine, None, 1),
+            ("scour_league", lambda _: app.scour_league(engine, "Buy-Low Candidates", "", name_index), None, 1),
+            ("mirror sync (incremental)", lambda _: mirror.sync(state["repo"], "History", force=True), None, 1),
+            ("mirror page (search)", lambda _: mirror.page("History", "team 1", offset=app.PAGE_SIZE), None, 1),
+            ("process_block_images_async", lambda _: asyncio.run(app.process_block_images_async(shots, roster_text, intel, True, name_index)), None, 1),
+        ]
+        for name, fn, setup, ops in scenarios:
+            key, gated = f"{name}@{n}", not name.startswith(INFORMATIONAL)
+            secs = timed(fn, a.repeat, setup)
+            if gated and regressed(stats(secs), (baseline or {}).get(key), a.tolerance):
+                secs += timed(fn, a.repeat * CONFIRM, setup)  # rule out a transient stall before flagging
+            r = results[key] = stats(secs, ops)
+            if not gated: r["gated"] = False
+            print(f"{name:<34} {n:>5} | {r['min_ms']:>9.2f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['ops_s']:>8}")
+
+    print(f"\nPer phase (tracing spans) · fake OpenRouter: {server.requests} requests, {server.errors} injected errors")
+    print(f"{'phase':<24} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'errors':>6} {'tokens':>9} {'est $':>8}")
+    for phase, s in tracing.TRACER.summary().items():
+        print(f"{phase:<24} {s['n']:>6} {s['p50']:>9} {s['p95']:>9} {s['errors']:>6} {s['tokens']:>9} {s['cost']:>8}")
+    client.close(); server.close()
+    return results
+
+def compare(results, baseline, tolerance):
+    return [(key, baseline[key].get("min_ms", baseline[key]["p50_ms"]), r["min_ms"])
+            for key, r in results.items() if regressed(r, baseline.get(key), tolerance)]
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--teams", type=int, nargs="+", default=[10, 30, 50])
+    ap.add_argument("--roster", type=int, default=40)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--screenshots", type=int, default=4)
+    ap.add_argument("--or-latency", type=float, default=0.08, help="median OpenRouter latency (s)")
+    ap.add_argument("--gemini-latency", type=float, default=0.08, help="median Gemini latency (s)")
+    ap.add_argument("--sheets-latency", type=float, default=0.01, help="median Sheets API call latency (s)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of OpenRouter requests answered 503")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown of the best run vs baseline")
+    a = ap.parse_args()
+    baseline_path = os.path.abspath(a.baseline)
+    baseline = None
+    if not a.save_baseline and os.path.exists(baseline_path):
+        with open(baseline_path) as f: baseline = json.load(f)
+    results = run(a, baseline)
+    if a.save_baseline:
+        with open(baseline_path, "w") as f: json.dump(results, f, indent=1, sort_keys=True)
+        print(f"\nBaseline saved to {baseline_path}")
+    elif baseline is not None:
+        regressions = compare(results, baseline, a.tolerance)
+        for key, old, new in regressions: print(f"REGRESSION {key}: min {old} -> {new} ms")
+        print(f"\n{len(regressions)} regression(s) vs {baseline_path} (tolerance {a.tolerance:.0%})")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,239 @@
+"""Local stand-ins for OpenRouter, Gemini and Google Sheets, for offline benchmarks.
+
+- `FakeOpenRouter`: an OpenRouter-compatible /chat/completions HTTP server
+  (plain JSON and SSE streaming) with log-normal latency and a configurable
+  error rate, so the real `OpenRouterClient` (pooling, retries) is exercised.
+- `FakeGeminiModel`: quacks like `genai.GenerativeModel` for the prompts
+  app.py sends (vision name lists, block JSON, position classification, verdicts).
+- `FakeSpreadsheet` / `FakeWorksheet`: in-memory gspread objects covering what
+  `SheetRepository` calls, with optional per-call latency.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from gspread.utils import a1_range_to_grid_range
+
+REPLY = ("**The Verdict**: WIN. Value score 72 vs 64. The incoming package adds speed and OBP while the "
+         "outgoing arm is an aging asset with elevated injury risk. 2026 line: .281/.352/.488, 24 HR, 18 SB. ")
+
+class Latency:
+    """Log-normal delay around a median; `jitter` is the sigma of the underlying normal."""
+
+    def __init__(self, median, jitter=0.3, seed=7):
+        self.median, self.jitter = median, jitter
+        self._rng = random.Random(seed); self._lock = threading.Lock()
+
+    def draw(self):
+        if self.median <= 0: return 0.0
+        with self._lock: return self.median * math.exp(self._rng.gauss(0, self.jitter))
+
+def reply_text(chars):
+    return (REPLY * (chars // len(REPLY) + 1))[:chars]
+
+# --- OpenRouter ---
+class FakeOpenRouter:
+    """
+    latency: median seconds per request, or {model_prefix: median}.
+    error_rate: share of requests answered with `error_status` (Retry-After: 0, so retries are immediate).
+    """
+
+    def __init__(self, latency=0.1, jitter=0.3, error_rate=0.0, error_status=503, reply_chars=1200, chunks=20, seed=7):
+        medians = latency if isinstance(latency, dict) else {"": latency}
+        self.latency = {k: Latency(v, jitter, seed + i) for i, (k, v) in enumerate(medians.items())}
+        self.error_rate, self.error_status = error_rate, error_status
+        self.reply_chars, self.chunks = reply_chars, chunks
+        self.requests = self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/api/v1/chat/completions"
+        threading.Thread(target=self._server.serve_forever, name="fake-openrouter", daemon=True).start()
+
+    def _delay(self, model):
+        key = max((k for k in self.latency if model.startswith(k)), key=len, default=None)
+        return self.latency[key].draw() if key is not None else 0.0
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args): pass
+
+            def _send(self, status, body, ctype="application/json", extra=()):
+                data = body.encode()
+                self.send_response(status); self.send_header("Content-Type", ctype); self.send_header("Content-Length", str(len(data)))
+                for k, v in extra: self.send_header(k, v)
+                self.end_headers(); self.wfile.write(data)
+
+            def _chunk(self, text):
+                data = text.encode(); self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n"); self.wfile.flush()
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                model = payload.get("model", ""); delay = fake._delay(model)
+                with fake._lock:
+                    fake.requests += 1
+                    failed = fake._rng.random() < fake.error_rate
+                    if failed: fake.errors += 1
+                if failed:
+                    time.sleep(delay / 4)
+                    return self._send(fake.error_status, json.dumps({"error": {"message": "fake upstream error"}}), extra=[("Retry-After", "0")])
+                text = reply_text(fake.reply_chars)
+                if not payload.get("stream"):
+                    time.sleep(delay)
+                    return self._send(200, json.dumps({"choices": [{"message": {"content": text}}]}))
+                self.send_response(200); self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked"); self.end_headers()
+                time.sleep(delay * 0.3)  # time to first token
+                step = math.ceil(len(text) / fake.chunks)
+                for i in range(0, len(text), step):
+                    self._chunk("data: " + json.dumps({"choices": [{"delta": {"content": text[i:i + step]}}]}) + "\n\n")
+                    time.sleep(delay * 0.7 / fake.chunks)
+                self._chunk("data: [DONE]\n\n"); self.wfile.write(b"0\r\n\r\n"); self.wfile.flush()
+
+        return Handler
+
+    def close(self):
+        self._server.shutdown(); self._server.server_close()
+
+# --- Gemini ---
+class FakeResponse:
+    def __init__(self, text, prompt_chars=0):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(prompt_token_count=prompt_chars // 4 + 1, candidates_token_count=len(text) // 4 + 1)
+
+class FakeGeminiModel:
+    """Stand-in for `genai.GenerativeModel`; answers are shaped by what the prompt asks for."""
+
+    def __init__(self, names=(), model_name="models/gemini-fake-flash", latency=0.2, jitter=0.3, reply_chars=1200, seed=7):
+        self.model_name, self.names, self.reply_chars = model_name, list(names), reply_chars
+        self.latency = Latency(latency, jitter, seed)
+        self._rng = random.Random(seed); self._lock = threading.Lock()
+        self.calls = 0
+
+    def _answer(self, contents):
+        prompt = contents if isinstance(contents, str) else " ".join(c for c in contents if isinstance(c, str))
+        if not isinstance(contents, str):  # vision: a screenshot of the trade block
+            with self._lock: picked = self._rng.sample(self.names, min(8, len(self.names)))
+            return prompt, "\n".join(picked)
+        if "Classify each player" in prompt:
+            names = json.loads(prompt.split("Players: ", 1)[1])
+            return prompt, json.dumps({n: "Pitcher" if i % 3 == 0 else "Hitter" for i, n in enumerate(names)})
+        if "Generate a JSON list" in prompt:
+            block = re.search(r"PLAYERS: (.*?)\n\s*DATA:", prompt, re.DOTALL)
+            players = [p.strip() for p in (block.group(1) if block else "").splitlines() if p.strip()]
+            rows = [{"Team": "Team 1", "Player": p, "Position": "UT", "Grade": "B", "Verdict": "PURSUE",
+                     "Impact_Pct": "+3%", "Outlook_Shift": "Contender", "Analysis": "Fits the window."} for p in players]
+            return prompt, "```json\n" + json.dumps(rows) + "\n```"
+        return prompt, reply_text(self.reply_chars)
+
+    def generate_content(self, contents, stream=False):
+        with self._lock: self.calls += 1
+        prompt, text = self._answer(contents); delay = self.latency.draw()
+        if not stream:
+            time.sleep(delay); return FakeResponse(text, len(prompt))
+        def chunks(n=10):
+            time.sleep(delay * 0.3); step = math.ceil(len(text) / n)
+            for i in range(0, len(text), step):
+                time.sleep(delay * 0.7 / n); yield FakeResponse(text[i:i + step])
+        return chunks()
+
+# --- Sheets ---
+def _trim(rows):
+    """Like the Sheets API: no trailing empty cells or rows."""
+    out = []
+    for r in rows:
+        r = list(r)
+        while r and r[-1] in ("", None): r.pop()
+        out.append(r)
+    while out and not out[-1]: out.pop()
+    return out
+
+def _split_range(rng):
+    if "!" in rng: title, a1 = rng.rsplit("!", 1)
+    else: title, a1 = rng, None
+    if title.startswith("'"): title = title[1:-1].replace("''", "'")
+    return title, a1
+
+class FakeWorksheet:
+    def __init__(self, sheet, title, rows=None, row_count=1000, col_count=26):
+        self._sheet, self.title = sheet, title
+        self.cells = [list(r) for r in (rows or [])]
+        self.row_count, self.col_count = max(row_count, len(self.cells)), col_count
+
+    def _set(self, r, c, v):
+        while len(self.cells) <= r: self.cells.append([])
+        row = self.cells[r]
+        while len(row) <= c: row.append("")
+        row[c] = v
+
+    def get_all_values(self):
+        self._sheet._call(); return _trim(self.cells)
+
+    def append_row(self, row):
+        self.append_rows([row])
+
+    def append_rows(self, rows):
+        self._sheet._call(); self.cells = _trim(self.cells) + [list(r) for r in rows]
+        self.row_count = max(self.row_count, len(self.cells))
+
+    def batch_update(self, data):
+        self._sheet._call()
+        for item in data:
+            g = a1_range_to_grid_range(item["range"])
+            for i, row in enumerate(item["values"]):
+                for j, v in enumerate(row): self._set(g["startRowIndex"] + i, g["startColumnIndex"] + j, v)
+
+    def update(self, rows):
+        self._sheet._call()
+        for i, row in enumerate(rows):
+            for j, v in enumerate(row): self._set(i, j, v)
+
+    def clear(self):
+        self._sheet._call(); self.cells = []
+
+    def add_rows(self, n):
+        self._sheet._call(); self.row_count += n
+
+class FakeSpreadsheet:
+    """In-memory spreadsheet: {title: matrix}, in tab order. `latency` is added to every API call."""
+
+    def __init__(self, sheets, latency=0.0, jitter=0.2, seed=7):
+        self._tabs = [FakeWorksheet(self, t, rows) for t, rows in sheets.items()]
+        self.latency = Latency(latency, jitter, seed)
+        self.calls = 0
+
+    def _call(self):
+        self.calls += 1; time.sleep(self.latency.draw())
+
+    def _tab(self, title):
+        return next(ws for ws in self._tabs if ws.title == title)
+
+    def worksheets(self):
+        self._call(); return list(self._tabs)
+
+    def values_batch_get(self, ranges):
+        self._call(); out = []
+        for rng in ranges:
+            title, a1 = _split_range(rng); cells = self._tab(title).cells
+            if a1:
+                g = a1_range_to_grid_range(a1)
+                cells = [r[g.get("startColumnIndex", 0):g.get("endColumnIndex")] for r in cells[g.get("startRowIndex", 0):g.get("endRowIndex")]]
+            out.append({"range": rng, "values": _trim(cells)})
+        return {"valueRanges": out}
+
+    def add_worksheet(self, title, rows, cols):
+        self._call(); ws = FakeWorksheet(self, title, row_count=rows, col_count=cols); self._tabs.append(ws)
+        return ws
+
+    def del_worksheet(self, ws):
+        self._call(); self._tabs.remove(ws)
@@ -0,0 +1,93 @@
+"""Deadline-bounded, hedged council runs.
+
+`run_council` starts every member at once and returns when all have answered
+or the total budget runs out, whichever is first. Each member also has its own
+timeout inside that budget. With hedging on, a member that is still running
+after its recent p90 latency gets a duplicate request; the first good answer
+wins and the other is cancelled. Members still running at the deadline are
+cancelled and reported as "pending".
+"""
+import asyncio
+import time
+from collections import defaultdict, deque
+
+from openrouter_client import LLMError
+
+HEDGE_MIN_SAMPLES = 5
+HEDGE_MIN_DELAY = 3.0   # never hedge sooner than this, even for fast models
+MIN_SAMPLE = 0.5        # faster "calls" are cache hits, not model latency
+
+class LatencyStats:
+    """Rolling per-member latency window used to pick hedge delays."""
+
+    def __init__(self, window=50):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, member, seconds):
+        if seconds >= MIN_SAMPLE: self._samples[member].append(seconds)
+
+    def p90(self, member):
+        s = sorted(self._samples.get(member, ()))
+        if len(s) < HEDGE_MIN_SAMPLES: return None
+        return s[min(int(len(s) * 0.9), len(s) - 1)]
+
+    def hedge_delay(self, member):
+        p = self.p90(member)
+        return None if p is None else max(p, HEDGE_MIN_DELAY)
+
+class Verdict:
+    __slots__ = ("member", "text", "status", "seconds", "hedged")
+
+    def __init__(self, member, text=None, status="pending", seconds=None, hedged=False):
+        self.member, self.text, self.status, self.seconds, self.hedged = member, text, status, seconds, hedged
+
+def is_error(result):
+    return result is None or isinstance(result, LLMError)
+
+async def _first_good(tasks, timeout):
+    """Wait for the first non-error result among `tasks`; (result, winner) or (last_error, None)."""
+    pending, last = set(tasks), None
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while pending:
+        left = None if deadline is None else max(deadline - time.monotonic(), 0)
+        done, pending = await asyncio.wait(pending, timeout=left, return_when=asyncio.FIRST_COMPLETED)
+        if not done: break
+        for t in done:
+            last = t.result() if not t.exception() else LLMError(detail=str(t.exception()))
+            if not is_error(last): return last, t
+    return last, None
+
+async def _run_member(name, factory, timeout, stats, hedge):
+    t0 = time.perf_counter(); primary = asyncio.ensure_future(factory(False)); tasks = [primary]; hedged = False
+    try:
+        delay = stats.hedge_delay(name) if (hedge and stats) else None
+        if delay is not None and (timeout is None or delay < timeout):
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.append(asyncio.ensure_future(factory(True))); hedged = True
+        left = None if timeout is None else max(timeout - (time.perf_counter() - t0), 0)
+        result, winner = await _first_good(tasks, left)
+        secs = round(time.perf_counter() - t0, 2)
+        if winner is not None:
+            if stats: stats.record(name, secs)
+            return Verdict(name, result, "ok", secs, hedged and winner is not primary)
+        if result is None: return Verdict(name, None, "timeout", secs, hedged)
+        return Verdict(name, result, "error", secs, hedged)
+    finally:
+        for t in tasks:
+            if not t.done(): t.cancel()
+
+async def run_council(members, budget=None, timeouts=None, stats=None, hedge=False):
+    """
+    members: {name: factory(hedge: bool) -> coroutine}. Returns {name: Verdict}.
+    budget=None waits for everyone (the classic gather behaviour).
+    """
+    timeouts = timeouts or {}
+    if budget is not None: timeouts = {n: min(timeouts.get(n, budget), budget) for n in members}
+    tasks = {asyncio.ensure_future(_run_member(n, f, timeouts.get(n), stats, hedge)): n for n, f in members.items()}
+    done, late = await asyncio.wait(tasks, timeout=budget)
+    verdicts = {tasks[t]: t.result() for t in done}
+    for t in late:
+        t.cancel(); verdicts[tasks[t]] = Verdict(tasks[t], None, "pending", budget)
+    if late: await asyncio.gather(*late, return_exceptions=True)
+    return {n: verdicts[n] for n in members}
@@ -0,0 +1,75 @@
+"""Background jobs for long analyses.
+
+A process-wide `JobRunner` runs work on a thread pool behind a submit/poll API
+so Streamlit reruns never block on a council run. Submissions are keyed by the
+caller (usually a hash of the inputs). While a job with the same key is still
+running, submitting again returns that job instead of starting a second one
+(single-flight). Jobs report phase/progress and partial output as they go.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_TTL = 1800  # finished jobs are kept this long for polling
+
+class Job:
+    def __init__(self, job_id, key, label):
+        self.id, self.key, self.label = job_id, key, label
+        self.status = "running"   # running | done | error
+        self.phase, self.progress = "Queued", 0.0
+        self.partial = {}         # streamed output so far, e.g. {"Gemini": "..."}
+        self.result = self.error = None
+        self.started, self.finished = time.time(), None
+
+    def report(self, phase, progress=None):
+        self.phase = phase
+        if progress is not None: self.progress = max(0.0, min(float(progress), 1.0))
+
+    @property
+    def done(self):
+        return self.status != "running"
+
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+class JobRunner:
+    def __init__(self, max_workers=4, ttl=JOB_TTL):
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gm-job")
+        self._jobs = {}
+        self._inflight = {}  # key -> job id
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, label="", **kwargs):
+        """Run fn(job, *args, **kwargs) in the pool, or join the identical job already running."""
+        with self._lock:
+            self._prune()
+            running = self._jobs.get(self._inflight.get(key))
+            if running and not running.done: return running
+            job = Job(f"job-{next(self._ids)}", key, label)
+            self._jobs[job.id] = job; self._inflight[key] = job.id
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        # `finished` is set before `status`: a job that reads as done always has its finish time
+        try:
+            job.result = fn(job, *args, **kwargs); job.report("Done", 1.0)
+            job.finished = time.time(); job.status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"; job.finished = time.time(); job.status = "error"
+        finally:
+            with self._lock:
+                if self._inflight.get(job.key) == job.id: del self._inflight[job.key]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def running(self):
+        return [j for j in list(self._jobs.values()) if not j.done]
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for jid in [jid for jid, j in self._jobs.items() if j.done and (j.finished or cutoff) < cutoff]: del self._jobs[jid]
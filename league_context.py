@@ -0,0 +1,75 @@
+"""Query-aware roster context for AI briefs.
+
+Instead of pasting `json.dumps(full_league_data)` (with every row/col
+coordinate) into each prompt, work out which teams and players a query touches
+and emit a compact plain-text roster summary that fits a token budget. Focus
+teams are listed in full; the rest of the league fills whatever budget is left
+and is reduced to roster counts once it runs out.
+"""
+from name_index import normalize_name
+
+CHARS_PER_TOKEN = 4
+MIN_LAST_NAME = 4     # shorter last names ("lee", "cruz") are too ambiguous for the first-name prefix match
+MIN_FIRST_PREFIX = 3  # "matt" for Matthew, "vlad" for Vladimir
+WINDOW_CUTOFF = 0.88
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def find_mentions(query, league_map, name_index):
+    """Return (teams, players) named in the query; players are (name, team) pairs."""
+    key = normalize_name(query); words = key.split()
+    teams = [t for t in league_map if normalize_name(t) and normalize_name(t) in key]
+    hits, used = name_index.mentions(query), set()  # exact names and "A. Judge" initials
+    for size in (3, 2):
+        for i in range(len(words) - size + 1):
+            # a lone letter is an initial only with its period, which mentions() already saw ("a judge ruled" is not one)
+            if used & set(range(i, i + size)) or len(words[i]) == 1: continue
+            found = name_index.search(" ".join(words[i:i + size]), n=1, cutoff=WINDOW_CUTOFF)
+            if found:
+                hits.append(found[0][1]); used |= set(range(i, i + size))
+    # a last name counts only after its own first name or a prefix of it ("Matt Olson"), never on its own:
+    # "Josh Lowe" is not Brandon Lowe and "Judge rules" is not Aaron Judge
+    for i, w in enumerate(words):
+        if not i or {i, i - 1} & used or len(w) < MIN_LAST_NAME: continue
+        prev = words[i - 1]
+        hits.extend(j for j in name_index.last_name_ids(w)
+                    if name_index.first_name(j) == prev or (len(prev) >= MIN_FIRST_PREFIX and name_index.first_name(j).startswith(prev)))
+    players, seen = [], set()
+    for i in hits:
+        if i in seen: continue
+        seen.add(i); players.append((name_index.names[i], name_index.teams[i]))
+        if name_index.teams[i] not in teams: teams.append(name_index.teams[i])
+    return teams, players
+
+def format_team(team, roster, limit=None):
+    names = [p["name"] for p in roster]
+    if limit is not None and len(names) > limit:
+        return f"[{team}] " + ", ".join(names[:limit]) + f", +{len(names) - limit} more"
+    return f"[{team}] " + ", ".join(names)
+
+def build_roster_context(query, league_map, name_index, focus_team=None, budget=3000):
+    """Compact roster summary for `query`, at most ~`budget` tokens."""
+    if not league_map: return "N/A"
+    teams, players = find_mentions(query or "", league_map, name_index)
+    if focus_team in league_map and focus_team not in teams: teams.insert(0, focus_team)
+    lines, left = [], budget
+    if players:
+        focus = "FOCUS PLAYERS: " + "; ".join(f"{n} ({t})" for n, t in players)
+        lines.append(focus); left -= estimate_tokens(focus)
+    for team in teams:
+        line = format_team(team, league_map[team])
+        if estimate_tokens(line) > left:
+            named = {n for n, t in players if t == team}
+            roster = [p for p in league_map[team] if p["name"] in named] + [p for p in league_map[team] if p["name"] not in named]
+            per_name = max(estimate_tokens(line) // max(len(roster), 1), 1)
+            line = format_team(team, roster, limit=max(left // per_name - 2, len(named)))
+        lines.append(line); left -= estimate_tokens(line)
+    skipped = []
+    for team, roster in league_map.items():
+        if team in teams: continue
+        line = format_team(team, roster)
+        if estimate_tokens(line) <= left - 20: lines.append(line); left -= estimate_tokens(line)
+        else: skipped.append(f"{team} ({len(roster)})")
+    if skipped: lines.append("[Rosters omitted for budget] " + ", ".join(skipped))
+    return "\n".join(lines)
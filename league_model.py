@@ -0,0 +1,204 @@
+"""Compact, indexed league model.
+
+Replaces the `{team: [{"name", "row", "col"}, ...]}` dict-of-lists with slotted
+`PlayerSlot` records plus hash indexes (player name -> slot, team -> column),
+with the HITTERS:/PITCHERS: section headers resolved into each player's
+category at parse time. `LeagueModel` is still a read-only Mapping of
+team -> roster list, and records still answer `p['name']` / `p.get('row')`, so
+code written against the old shape keeps working.
+
+Trades touch only the two team columns, in time linear in those two rosters:
+an incoming player takes a free cell in its own category's section (usually
+one its new team just vacated), or else is inserted at the end of that
+section, shifting the cells below it down a row. Leftover vacated cells are
+blanked. The returned `Trade` lists exactly the cells that changed and can be
+undone.
+"""
+from collections.abc import Mapping
+
+from name_index import normalize_name
+
+SECTIONS = {"HITTERS:": "Hitter", "PITCHERS:": "Pitcher"}
+
+class PlayerSlot:
+    __slots__ = ("name", "team", "row", "col", "category")
+
+    def __init__(self, name, team, row, col, category="Unknown"):
+        self.name, self.team, self.row, self.col, self.category = name, team, row, col, category
+
+    # dict-style access for code written against the old roster dicts
+    def __getitem__(self, key):
+        try: return getattr(self, key)
+        except AttributeError: raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return f"PlayerSlot({self.name!r}, {self.team!r}, r{self.row}c{self.col}, {self.category})"
+
+class Trade:
+    __slots__ = ("cells", "moves", "next_rows", "headers")
+
+    def __init__(self):
+        self.cells = []      # (row, col, old_value, new_value), 1-based sheet coordinates
+        self.moves = []      # (slot, team, row, col, category) before the trade, incl. slots shifted down
+        self.next_rows = {}  # team -> next free row before the trade
+        self.headers = {}    # team -> section headers before the trade
+
+class LeagueModel(Mapping):
+    def __init__(self):
+        self._rosters = {}    # team -> {id(slot): PlayerSlot}; two players may share a name
+        self._views = {}      # team -> cached row-ordered list
+        self._by_name = None  # normalized name -> [PlayerSlot], built on first lookup
+        self.team_cols = {}   # team -> 1-based column
+        self.next_row = {}    # team -> first free row below the last used cell
+        self.headers = {}     # team -> {row: section header text}
+
+    @classmethod
+    def from_matrix(cls, matrix, team_matcher, team_names=()):
+        """Parse the horizontal roster sheet: one team per column, section headers end with ':'."""
+        league = cls()
+        for t in team_names: league._rosters[t] = {}
+        if not matrix: return league
+        for col_idx, header_val in enumerate(matrix[0]):
+            team = team_matcher.best(str(header_val).strip(), cutoff=0.9)
+            if not team: continue
+            league._rosters.setdefault(team, {}); league.team_cols[team] = col_idx + 1
+            category, last = "Unknown", 1
+            for row_idx in range(1, len(matrix)):
+                row = matrix[row_idx]
+                if col_idx >= len(row): continue
+                val = str(row[col_idx]).strip()
+                if not val: continue
+                last = row_idx + 1
+                if val.endswith(':'):
+                    league.headers.setdefault(team, {})[row_idx + 1] = val
+                    category = SECTIONS.get(val.upper(), category); continue
+                league._add(PlayerSlot(val, team, row_idx + 1, col_idx + 1, category))
+            league.next_row[team] = max(league.next_row.get(team, 2), last + 1)
+        return league
+
+    def _add(self, slot):
+        self._rosters[slot.team][id(slot)] = slot
+
+    # --- Mapping: team -> roster list ---
+    def __getitem__(self, team):
+        view = self._views.get(team)
+        if view is None:
+            view = self._views[team] = sorted(self._rosters[team].values(), key=lambda p: p.row)
+        return view
+
+    def __iter__(self):
+        return iter(self._rosters)
+
+    def __len__(self):
+        return len(self._rosters)
+
+    # --- lookups ---
+    def find(self, name, team=None):
+        """Exact (normalized) name lookup, optionally within one team."""
+        return next(self._matches(name, team), None)
+
+    def _matches(self, name, team=None):
+        if self._by_name is None:
+            self._by_name = {}
+            for p in self.players(): self._by_name.setdefault(normalize_name(p.name), []).append(p)
+        return (slot for slot in self._by_name.get(normalize_name(name), ()) if team is None or slot.team == team)
+
+    def players(self):
+        for roster in self._rosters.values(): yield from roster.values()
+
+    # --- trades ---
+    def _take(self, names, team):
+        slots = []
+        for n in names:  # a name listed twice takes both same-named players, if the team has two
+            slot = next((p for p in self._matches(n, team) if all(p is not q for q in slots)), None)
+            if slot is None: raise KeyError(f"{n} is not on {team}")
+            slots.append(slot)
+        return slots
+
+    def _column(self, team):
+        """{row: value} of a team's column below the team header."""
+        cells = {p.row: p.name for p in self._rosters[team].values()}
+        cells.update(self.headers.get(team, {}))
+        return cells
+
+    def section_at(self, team, row):
+        """Category of the section a row falls in (per the nearest section header above it)."""
+        category = "Unknown"
+        for r, text in sorted(self.headers.get(team, {}).items()):
+            if r >= row: break
+            category = SECTIONS.get(text.upper(), category)
+        return category
+
+    def _section_rows(self, team, category):
+        """(first, end) rows of a category's section in a team column, end exclusive; None if it has none."""
+        headers = sorted(self.headers.get(team, {}).items())
+        for i, (r, text) in enumerate(headers):
+            if SECTIONS.get(text.upper()) == category:
+                return r + 1, headers[i + 1][0] if i + 1 < len(headers) else self.next_row[team]
+        return None
+
+    def _shift(self, trade, team, row, moved, taken):
+        """Move every cell of a team column at or below `row` down one row; returns the shifted `taken` rows."""
+        for p in self._rosters[team].values():
+            if p.row < row: continue
+            if id(p) not in moved: moved.add(id(p)); trade.moves.append((p, p.team, p.row, p.col, p.category))
+            p.row += 1
+        self.headers[team] = {(r + 1 if r >= row else r): t for r, t in self.headers.get(team, {}).items()}
+        self.next_row[team] += 1
+        return {r + 1 if r >= row else r for r in taken}
+
+    def _place(self, trade, incoming, team, moved):
+        col = self.team_cols[team]; taken = set(self._column(team))
+        for p in incoming:
+            rows = self._section_rows(team, p.category)
+            if rows is None: row = self.next_row[team]; self.next_row[team] += 1 # no such section: bottom of the column
+            else:
+                row = next((r for r in range(*rows) if r not in taken), None) # a free cell in its own section
+                if row is None:
+                    row = rows[1]
+                    if row < self.next_row[team]: taken = self._shift(trade, team, row, moved, taken)
+                    else: self.next_row[team] = row + 1
+            p.team, p.row, p.col, p.category = team, row, col, self.section_at(team, row)
+            self._rosters[team][id(p)] = p; taken.add(row)
+
+    def apply_trade(self, team_a, names_a, team_b, names_b):
+        """Move names_a from team_a to team_b and names_b the other way. Returns the Trade (cell edits)."""
+        out_a, out_b = self._take(names_a, team_a), self._take(names_b, team_b)
+        trade = Trade(); teams = (team_a, team_b)
+        trade.next_rows = {t: self.next_row.get(t) for t in teams}
+        trade.headers = {t: dict(self.headers.get(t, {})) for t in teams}
+        before = {t: self._column(t) for t in teams}
+        moved = set()
+        for p in out_a + out_b:
+            moved.add(id(p)); trade.moves.append((p, p.team, p.row, p.col, p.category)); del self._rosters[p.team][id(p)]
+        self._place(trade, out_b, team_a, moved)
+        self._place(trade, out_a, team_b, moved)
+        for t in teams:
+            after, col = self._column(t), self.team_cols[t]
+            for row in sorted(set(before[t]) | set(after)):
+                old, new = before[t].get(row, ""), after.get(row, "")
+                if old != new: trade.cells.append((row, col, old, new))
+            self._views.pop(t, None)
+        return trade
+
+    def undo(self, trade):
+        for p, team, row, col, category in trade.moves:
+            self._rosters[p.team].pop(id(p), None); self._views.pop(p.team, None)
+        for p, team, row, col, category in trade.moves:
+            p.team, p.row, p.col, p.category = team, row, col, category; self._rosters[team][id(p)] = p
+            self._views.pop(team, None)
+        self.next_row.update({t: r for t, r in trade.next_rows.items() if r is not None})
+        self.headers.update(trade.headers)
+
+def patch_matrix(matrix, cells):
+    """Copy of `matrix` with (row, col, old, new) edits applied; only touched rows are copied."""
+    out = list(matrix); width = max([len(r) for r in matrix] or [0])
+    for row, col, _, new in cells:
+        while len(out) < row: out.append([""] * width)
+        r = out[row - 1] = list(out[row - 1])
+        while len(r) < col: r.append("")
+        r[col - 1] = new
+    return out
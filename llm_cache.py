@@ -0,0 +1,90 @@
+"""Persistent, content-addressed cache for LLM and research calls.
+
+Entries live in a small SQLite file keyed by a SHA-256 of everything that
+determines the answer (model id, persona, prompt, roster version), so a
+byte-identical question inside its TTL window is served from disk instead of
+another round trip. Size is bounded by least-recently-used eviction.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL = 3600
+MAX_BYTES = 50 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    model TEXT,
+    task TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_used);
+"""
+
+def make_key(*parts):
+    h = hashlib.sha256()
+    for p in parts:
+        b = str(p).encode("utf-8")
+        h.update(len(b).to_bytes(8, "big")); h.update(b)
+    return h.hexdigest()
+
+class LLMCache:
+    def __init__(self, path, ttls=None, max_bytes=MAX_BYTES):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttls = dict(ttls or {})
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def ttl_for(self, task):
+        return self.ttls.get(task, DEFAULT_TTL)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row and row[1] > now:
+                self._db.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[0]
+            if row: self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+    def put(self, key, value, task=None, model=None, ttl=None):
+        now = time.time(); ttl = self.ttl_for(task) if ttl is None else ttl
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, value, model, task, size, now, now + ttl, now))
+            self._evict(now)
+
+    def _evict(self, now):
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes: return
+        for key, size in self._db.execute("SELECT key, size FROM llm_cache ORDER BY last_used").fetchall():
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes: break
+
+    def clear(self):
+        with self._lock: self._db.execute("DELETE FROM llm_cache")
+
+    def stats(self):
+        with self._lock:
+            n, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {"entries": n, "bytes": total, "hits": self.hits, "misses": self.misses}
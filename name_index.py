@@ -0,0 +1,151 @@
+"""League-wide player name index.
+
+Built once per roster load (see `load_league_data`) and shared by every fuzzy
+lookup in the app, so name matching no longer rebuilds and rescans roster lists
+with `difflib` for every name. Candidates come from a character trigram
+inverted index; only the best few are scored with `SequenceMatcher`, which keeps
+scores (and cutoffs) identical to `difflib.get_close_matches`.
+"""
+import difflib
+import re
+import unicodedata
+from collections import defaultdict
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+MAX_SCORED = 40     # candidates scored per query after trigram ranking
+FULL_SCAN_MAX = 64  # scopes this small are scored exhaustively
+INITIAL_RE = re.compile(r"\b([A-Za-z])\.\s*([^\W\d_][\w'-]*)")  # "A. Judge"; the period keeps "a judge ruled" out
+
+def normalize_name(name):
+    """'Ronald Acuña Jr.' -> 'ronald acuna'. Accents, punctuation and suffixes dropped."""
+    s = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode().lower()
+    tokens = [t for t in re.sub(r"[^a-z0-9 ]+", " ", s).split() if t not in SUFFIXES]
+    return " ".join(tokens)
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def split_initial(raw):
+    """'Z. Neto' / 'Z Neto' -> ('z', 'neto'); anything else -> None."""
+    m = re.match(r"^\s*([A-Za-z])\s*\.?\s+(.+)$", str(raw)) or re.match(r"^\s*([A-Za-z])\.\s*(.+)$", str(raw))
+    if not m: return None
+    last = normalize_name(m.group(2)).split()
+    return (m.group(1).lower(), last[-1]) if last else None
+
+class NameMatcher:
+    """Fuzzy matcher over a fixed list of names (team headers, traded players...)."""
+
+    def __init__(self, names):
+        self.names = []
+        self._norm = []
+        self._by_key = defaultdict(list)
+        self._grams = defaultdict(list)
+        self._initials = defaultdict(list)
+        self._last = defaultdict(list)
+        self._max_words = 0
+        for n in names: self._add(n)
+
+    def _add(self, name):
+        i = len(self.names); key = normalize_name(name)
+        self.names.append(name); self._norm.append(key)
+        self._by_key[key].append(i)
+        for g in trigrams(key): self._grams[g].append(i)
+        parts = key.split(); self._max_words = max(self._max_words, len(parts))
+        if len(parts) >= 2:
+            self._initials[(parts[0][0], parts[-1])].append(i); self._last[parts[-1]].append(i)
+        return i
+
+    def _candidates(self, key, scope):
+        if scope is not None and len(scope) <= FULL_SCAN_MAX:
+            return scope
+        counts = defaultdict(int)
+        for g in trigrams(key):
+            for i in self._grams.get(g, ()):
+                if scope is None or i in scope: counts[i] += 1
+        return sorted(counts, key=counts.get, reverse=True)[:MAX_SCORED]
+
+    def search(self, query, n=1, cutoff=0.6, scope=None):
+        """Return up to `n` (score, id) pairs, best first, scoring like `get_close_matches`."""
+        key = normalize_name(query)
+        if not key: return []
+        exact = [i for i in self._by_key.get(key, ()) if scope is None or i in scope]
+        if exact: return [(1.0, i) for i in exact[:n]]
+        scored = []
+        sm = difflib.SequenceMatcher(); sm.set_seq2(key)
+        for i in self._candidates(key, scope):
+            sm.set_seq1(self._norm[i])
+            if sm.real_quick_ratio() >= cutoff and sm.quick_ratio() >= cutoff:
+                r = sm.ratio()
+                if r >= cutoff: scored.append((r, i))
+        if not scored:
+            ini = split_initial(query)
+            if ini: scored = [(cutoff, i) for i in self._initials.get(ini, ()) if scope is None or i in scope]
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored[:n]
+
+    def last_name_ids(self, token):
+        return list(self._last.get(normalize_name(token), ()))
+
+    def first_name(self, i):
+        return self._norm[i].split()[0] if self._norm[i] else ""
+
+    def mentions(self, text):
+        """
+        Ids of names written out in free text: exact normalized full names, or an initial with a period and the
+        last name ("A. Judge"). Hash lookups only, cheap enough to run over every news item.
+        """
+        words, hits, i = normalize_name(text).split(), [], 0
+        while i < len(words):
+            for size in range(min(self._max_words, len(words) - i), 1, -1):
+                ids = self._by_key.get(" ".join(words[i:i + size]))
+                if ids: hits.extend(ids); i += size; break
+            else: i += 1
+        for initial, last in INITIAL_RE.findall(str(text)):
+            last = normalize_name(last).split()
+            if last: hits.extend(self._initials.get((initial.lower(), last[-1]), ()))
+        return list(dict.fromkeys(hits))
+
+    def best(self, query, cutoff=0.6):
+        hit = self.search(query, n=1, cutoff=cutoff)
+        return self.names[hit[0][1]] if hit else None
+
+class PlayerNameIndex(NameMatcher):
+    """Player index over a parsed league map ({team: [{"name", "row", "col"}, ...]})."""
+
+    def __init__(self, league_map):
+        self.players = []
+        self.teams = []
+        self._team_ids = defaultdict(set)
+        super().__init__([])
+        for team, roster in (league_map or {}).items():
+            for p in roster:
+                i = self._add(p["name"])
+                self.players.append(p); self.teams.append(team)
+                self._team_ids[team].add(i)
+
+    def _scope(self, team=None, among=None):
+        scope = None
+        if team is not None: scope = self._team_ids.get(team, set())
+        if among is not None:
+            wanted = {normalize_name(a) for a in among}
+            ids = {i for k in wanted for i in self._by_key.get(k, ())}
+            scope = ids if scope is None else scope & ids
+        return scope
+
+    def lookup(self, query, team=None, cutoff=0.6, among=None):
+        """Best matching player dict, optionally restricted to a team and/or a list of names."""
+        scope = self._scope(team, among)
+        if scope is not None and not scope: return None
+        hit = self.search(query, n=1, cutoff=cutoff, scope=scope)
+        return self.players[hit[0][1]] if hit else None
+
+    def roster(self, team):
+        return [self.players[i] for i in sorted(self._team_ids.get(team, ()))]
+
+    def team_of(self, query, cutoff=0.6):
+        hit = self.search(query, n=1, cutoff=cutoff)
+        return self.teams[hit[0][1]] if hit else None
+
+    def __len__(self):
+        return len(self.players)
@@ -0,0 +1,222 @@
+"""Background multi-feed news ingestion.
+
+`NewsPoller` polls several RSS/Atom feeds on a daemon thread with conditional
+GETs (If-None-Match / If-Modified-Since from the feed's last ETag and
+Last-Modified), so unchanged feeds cost a 304 and no parsing. New items are
+deduplicated across feeds by canonical link and by normalized headline, tagged
+with the rostered players they name in full or by initial ("A. Judge"; hash
+lookups on the shared `PlayerNameIndex`, never a fuzzy scan), and
+kept in a bounded SQLite `NewsStore`. The UI only ever reads the store, so
+rendering the wire or a team's news never touches the network.
+"""
+import calendar
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from llm_cache import make_key
+from name_index import normalize_name
+from tracing import measure, span
+
+POLL_SECS = 600
+MAX_ITEMS = 1000
+TIMEOUT = 10
+SUMMARY_CHARS = 400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_items (
+    id TEXT PRIMARY KEY,
+    title_key TEXT NOT NULL UNIQUE,
+    feed TEXT,
+    title TEXT NOT NULL,
+    link TEXT,
+    summary TEXT,
+    published REAL NOT NULL,
+    fetched REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS news_items_published ON news_items (published);
+CREATE TABLE IF NOT EXISTS news_tags (
+    item_id TEXT NOT NULL,
+    player TEXT NOT NULL,
+    team TEXT NOT NULL,
+    PRIMARY KEY (item_id, player)
+);
+CREATE INDEX IF NOT EXISTS news_tags_team ON news_tags (team);
+CREATE TABLE IF NOT EXISTS news_feeds (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    modified TEXT,
+    checked REAL,
+    status INTEGER,
+    new_items INTEGER,
+    error TEXT
+);
+"""
+
+def canonical_link(link):
+    """Link without scheme, query or fragment, so tracking parameters don't defeat dedupe."""
+    parts = urlsplit(str(link or "").strip())
+    return (parts.netloc.lower().removeprefix("www.") + parts.path.rstrip("/")) if parts.netloc else ""
+
+def strip_html(text):
+    return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", str(text or ""))).strip()
+
+def entry_item(feed_url, entry, now):
+    title = strip_html(entry.get("title"))
+    if not title: return None
+    link = entry.get("link", "")
+    stamp = entry.get("published_parsed") or entry.get("updated_parsed")
+    return {"id": make_key("news", canonical_link(link) or normalize_name(title)), "title_key": normalize_name(title),
+            "feed": feed_url, "title": title, "link": link, "summary": strip_html(entry.get("summary"))[:SUMMARY_CHARS],
+            "published": calendar.timegm(stamp) if stamp else now, "fetched": now}
+
+class NewsStore:
+    def __init__(self, path, max_items=MAX_ITEMS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path, self.max_items = path, max_items
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    # --- feeds ---
+    def feed_state(self, url):
+        with self._lock:
+            row = self._db.execute("SELECT etag, modified FROM news_feeds WHERE url = ?", (url,)).fetchone()
+        return row or (None, None)
+
+    def save_feed_state(self, url, etag, modified, status, new_items=0, error=None):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO news_feeds VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (url, etag, modified, time.time(), status, new_items, error))
+
+    def feeds(self):
+        with self._lock:
+            rows = self._db.execute("SELECT url, checked, status, new_items, error FROM news_feeds ORDER BY url").fetchall()
+        return [dict(zip(("url", "checked", "status", "new_items", "error"), r)) for r in rows]
+
+    # --- items ---
+    def add(self, items, tagger=None):
+        """Insert unseen items (by id and by headline), tag them, trim to max_items. Returns the number added."""
+        added = []
+        with self._lock, self._transaction():
+            for it in items:
+                cur = self._db.execute("INSERT OR IGNORE INTO news_items VALUES (:id, :title_key, :feed, :title, :link, :summary, :published, :fetched)", it)
+                if cur.rowcount: added.append(it)
+            if tagger: self._tag(added, tagger)
+            self._evict()
+        return len(added)
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("BEGIN")
+        try: yield
+        except BaseException: self._db.execute("ROLLBACK"); raise
+        self._db.execute("COMMIT")
+
+    def _tag(self, items, tagger):
+        for it in items:
+            for player, team in tagger(f"{it['title']}. {it['summary']}"):
+                self._db.execute("INSERT OR IGNORE INTO news_tags VALUES (?, ?, ?)", (it["id"], player, team))
+
+    def retag(self, tagger):
+        """Re-run tagging over every stored item (after a roster change).
+        Tags are computed without the lock; only the swap holds it, in one short transaction."""
+        with self._lock:
+            rows = self._db.execute("SELECT id, title, summary FROM news_items").fetchall()
+        tags = [(i, player, team) for i, t, s in rows for player, team in tagger(f"{t}. {s or ''}")]
+        with self._lock, self._transaction():
+            self._db.executemany("DELETE FROM news_tags WHERE item_id = ?", ((i,) for i, _, _ in rows))
+            self._db.executemany("INSERT OR IGNORE INTO news_tags SELECT ?, ?, ? WHERE EXISTS "
+                                 "(SELECT 1 FROM news_items WHERE id = ?)", ((i, p, t, i) for i, p, t in tags))
+
+    def _evict(self):
+        n = self._db.execute("SELECT COUNT(*) FROM news_items").fetchone()[0]
+        if n <= self.max_items: return
+        self._db.execute("DELETE FROM news_items WHERE id IN (SELECT id FROM news_items ORDER BY published LIMIT ?)", (n - self.max_items,))
+        self._db.execute("DELETE FROM news_tags WHERE item_id NOT IN (SELECT id FROM news_items)")
+
+    def _rows(self, sql, args):
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+            tags = {}
+            ids = [r[0] for r in rows]
+            if ids:
+                q = f"SELECT item_id, player, team FROM news_tags WHERE item_id IN ({','.join('?' * len(ids))})"
+                for item_id, player, team in self._db.execute(q, ids): tags.setdefault(item_id, []).append((player, team))
+        keys = ("id", "title", "link", "summary", "published", "feed")
+        return [dict(zip(keys, r), players=tags.get(r[0], [])) for r in rows]
+
+    def latest(self, n=10):
+        return self._rows("SELECT id, title, link, summary, published, feed FROM news_items ORDER BY published DESC LIMIT ?", (n,))
+
+    def for_team(self, team, n=20):
+        """Newest items mentioning any player rostered by `team`."""
+        return self._rows("SELECT id, title, link, summary, published, feed FROM news_items WHERE id IN "
+                          "(SELECT item_id FROM news_tags WHERE team = ?) ORDER BY published DESC LIMIT ?", (team, n))
+
+    def stats(self):
+        with self._lock:
+            n, tagged = self._db.execute("SELECT (SELECT COUNT(*) FROM news_items), (SELECT COUNT(DISTINCT item_id) FROM news_tags)").fetchone()
+        return {"items": n, "tagged": tagged}
+
+class NewsPoller:
+    def __init__(self, store, feeds, interval=POLL_SECS, timeout=TIMEOUT):
+        self.store, self.feeds, self.interval = store, list(feeds), interval
+        self._http = httpx.Client(timeout=timeout, follow_redirects=True, headers={"User-Agent": "DynastyGM/1.0 (+news poller)"})
+        self._generation = self._tagger = None
+        self._retag = False
+        self._wake = threading.Event()
+        self.last_poll = None
+        threading.Thread(target=self._loop, name="news-poller", daemon=True).start()
+
+    def set_roster(self, name_index, generation):
+        """Tag against the roster snapshot of `generation`; existing items are re-tagged on the poller thread when it changes."""
+        if generation == self._generation: return
+        self._generation = generation
+        self._tagger = lambda text: [(name_index.names[i], name_index.teams[i]) for i in name_index.mentions(text)]
+        self._retag = True; self._wake.set()
+
+    def poll_now(self):
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            try: self.poll()
+            except Exception: pass  # a bad poll must not kill the thread; per-feed errors are stored
+            self._wake.wait(self.interval); self._wake.clear()
+
+    def poll(self):
+        if self._retag and self._tagger:
+            self._retag = False; self.store.retag(self._tagger)
+        with ThreadPoolExecutor(max(len(self.feeds), 1), thread_name_prefix="news-feed") as pool:
+            results = list(pool.map(self._fetch, self.feeds))
+        for url, items, etag, modified, status, error in results:
+            added = self.store.add(items, self._tagger) if items else 0
+            self.store.save_feed_state(url, etag, modified, status, added, error)
+        self.last_poll = time.time()
+
+    def _fetch(self, url):
+        import feedparser  # deferred: only the poller thread parses feeds
+        etag, modified = self.store.feed_state(url)
+        headers = {k: v for k, v in (("If-None-Match", etag), ("If-Modified-Since", modified)) if v}
+        with span("news.fetch", feed=url) as s:
+            try: r = self._http.get(url, headers=headers)
+            except httpx.HTTPError as e:
+                s["error"] = type(e).__name__; return url, [], etag, modified, None, str(e)
+            s["status"] = r.status_code
+            if r.status_code == 304: return url, [], etag, modified, 304, None
+            if r.status_code != 200: return url, [], etag, modified, r.status_code, r.text[:200]
+            measure(s, received=r.text, tokens=False)
+        now = time.time()
+        with span("parse.news", feed=url):
+            parsed = feedparser.parse(r.content)
+            items = [it for it in (entry_item(url, e, now) for e in parsed.entries) if it]
+        return url, items, r.headers.get("ETag"), r.headers.get("Last-Modified"), 200, None
@@ -0,0 +1,155 @@
+"""Shared, connection-pooled OpenRouter client.
+
+One `httpx.AsyncClient` lives on a dedicated background event loop for the
+whole process, so TCP/TLS connections stay alive across Streamlit reruns (each
+of which starts its own `asyncio.run` loop). Callers on any loop simply
+`await client.chat(...)` or `async for delta in client.stream(...)`.
+
+Per-provider semaphores bound concurrency (the provider is the model id prefix,
+e.g. "perplexity" in "perplexity/sonar"); 429/5xx and transport errors are
+retried with full-jitter exponential backoff, honouring Retry-After. Failures
+come back as `LLMError`, a `str` subclass that still renders as the old
+"Error 500: ..." text but carries status, provider and retryability.
+"""
+import asyncio
+import json
+import random
+import threading
+
+import httpx
+
+API_URL = "https://openrouter.ai/api/v1/chat/completions"
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+PROVIDER_LIMITS = {"perplexity": 4, "openai": 4, "anthropic": 4, "google": 4}
+DEFAULT_LIMIT = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+class LLMError(str):
+    """A failed model call. Behaves like the legacy error string; check with isinstance()."""
+
+    def __new__(cls, provider="", status=None, detail="", retryable=False):
+        text = f"Error {status}: {detail}" if status else f"Error: {detail}"
+        obj = super().__new__(cls, text.strip().rstrip(":"))
+        obj.provider, obj.status, obj.detail, obj.retryable = provider, status, detail, retryable
+        return obj
+
+class LLMCallError(Exception):
+    """Raised out of `stream()`; `.error` holds the LLMError."""
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+def provider_of(model_id):
+    return model_id.split("/", 1)[0] if "/" in model_id else model_id
+
+def backoff_delay(attempt, retry_after=None):
+    if retry_after:
+        try: return min(float(retry_after), BACKOFF_CAP)
+        except ValueError: pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def parse_sse_line(line):
+    """Delta text from one SSE line, "" for keep-alives/comments, None at [DONE]."""
+    if not line.startswith("data: "): return ""
+    payload = line[6:].strip()
+    if payload == "[DONE]": return None
+    choices = json.loads(payload).get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content") or ""
+
+class OpenRouterClient:
+    def __init__(self, api_key, referer="https://streamlit.io", url=API_URL, limits=None,
+                 max_retries=3, timeout=45, max_connections=20):
+        self.url = url
+        self.max_retries = max_retries
+        self.limits = {**PROVIDER_LIMITS, **(limits or {})}
+        self._headers = {"Authorization": f"Bearer {api_key}", "HTTP-Referer": referer}
+        self._timeout = httpx.Timeout(timeout, connect=10)
+        self._pool = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=90)
+        self._client = None
+        self._sems = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="openrouter-io", daemon=True)
+        self._thread.start()
+
+    def limit(self, model_id):
+        """Concurrent requests allowed for this model's provider."""
+        return self.limits.get(provider_of(model_id), DEFAULT_LIMIT)
+
+    # --- runs on the background loop ---
+    def _http(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(headers=self._headers, timeout=self._timeout, limits=self._pool)
+        return self._client
+
+    def _slot(self, model_id):
+        p = provider_of(model_id)
+        if p not in self._sems: self._sems[p] = asyncio.Semaphore(self.limit(model_id))
+        return self._sems[p]
+
+    async def _chat(self, model_id, messages):
+        payload = {"model": model_id, "messages": messages}; provider = provider_of(model_id)
+        async with self._slot(model_id):
+            for attempt in range(self.max_retries + 1):
+                retry_after = None
+                try: r = await self._http().post(self.url, json=payload)
+                except httpx.TransportError as e: err = LLMError(provider, None, f"{type(e).__name__}: {e}", True)
+                else:
+                    if r.status_code == 200:
+                        try: return r.json()["choices"][0]["message"]["content"]
+                        except (ValueError, KeyError, IndexError, TypeError) as e: return LLMError(provider, 200, f"Malformed response ({e})")
+                    retry_after = r.headers.get("Retry-After")
+                    err = LLMError(provider, r.status_code, r.text[:200], r.status_code in RETRY_STATUSES)
+                if not err.retryable or attempt == self.max_retries: return err
+                await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+    async def _stream(self, model_id, messages, emit):
+        payload = {"model": model_id, "messages": messages, "stream": True}; provider = provider_of(model_id)
+        async with self._slot(model_id):
+            for attempt in range(self.max_retries + 1):
+                started, retry_after = False, None
+                try:
+                    async with self._http().stream("POST", self.url, json=payload) as r:
+                        if r.status_code == 200:
+                            async for line in r.aiter_lines():
+                                delta = parse_sse_line(line)
+                                if delta is None: break
+                                if delta: started = True; emit(delta)
+                            return
+                        body = (await r.aread()).decode("utf-8", "replace")
+                        retry_after = r.headers.get("Retry-After")
+                        err = LLMError(provider, r.status_code, body[:200], r.status_code in RETRY_STATUSES)
+                except httpx.TransportError as e:
+                    err = LLMError(provider, None, f"{type(e).__name__}: {e}", not started)
+                if not err.retryable or attempt == self.max_retries: raise LLMCallError(err)
+                await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+    # --- callable from any loop ---
+    async def chat(self, model_id, messages):
+        """Full completion text, or an LLMError."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._chat(model_id, messages), self._loop))
+
+    async def stream(self, model_id, messages):
+        """Yield completion deltas as they arrive; raises LLMCallError on failure."""
+        caller = asyncio.get_running_loop(); q = asyncio.Queue(); done = object()
+        def put(item):
+            try: caller.call_soon_threadsafe(q.put_nowait, item)
+            except RuntimeError: pass # caller's loop already closed
+        async def produce():
+            try: await self._stream(model_id, messages, put)
+            except LLMCallError as e: put(e)
+            except Exception as e: put(LLMCallError(LLMError(provider_of(model_id), None, f"{type(e).__name__}: {e}")))
+            finally: put(done)
+        fut = asyncio.run_coroutine_threadsafe(produce(), self._loop)
+        try:
+            while (item := await q.get()) is not done:
+                if isinstance(item, Exception): raise item
+                yield item
+        finally:
+            if not fut.done(): fut.cancel()
+
+    def close(self):
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
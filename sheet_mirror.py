@@ -0,0 +1,178 @@
+"""Local SQLite mirror of append-mostly worksheets (History, Trade Block).
+
+`sync` reads only from the last mirrored row onwards: that row is fetched
+again as an overlap check, and if it no longer matches (rows deleted, sheet
+reset, edits at the tail) the worksheet is re-mirrored from scratch. Syncs are
+skipped while the mirror is younger than its TTL and the repository has not
+invalidated the worksheet since.
+
+Views are served from the mirror with SQL paging, a case-insensitive text
+search and per-column filters, so a page costs the same however many seasons
+of trades the sheet holds. Exports stream rows out in chunks to a temporary
+file (CSV, or XLSX via xlsxwriter's constant-memory mode).
+"""
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from tracing import span
+
+TTL = 600
+PAGE_SIZE = 50
+EXPORT_CHUNK = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirror_rows (
+    sheet TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    cells TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (sheet, row)
+);
+CREATE TABLE IF NOT EXISTS mirror_meta (
+    sheet TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    last TEXT,
+    header TEXT,
+    generation TEXT,
+    synced REAL
+);
+"""
+
+def row_key(cells):
+    """A row's identity for the overlap check, independent of how wide its batch was padded."""
+    cells = [str(c) for c in cells]
+    while cells and cells[-1] == "": cells.pop()
+    return json.dumps(cells)
+
+def row_text(cells):
+    return " ".join(str(c) for c in cells if c not in ("", None)).lower()
+
+class SheetMirror:
+    def __init__(self, path, ttl=TTL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path, self.ttl = path, ttl
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("BEGIN")
+        try: yield
+        except BaseException: self._db.execute("ROLLBACK"); raise
+        self._db.execute("COMMIT")
+
+    # --- sync ---
+    def meta(self, sheet):
+        with self._lock:
+            row = self._db.execute("SELECT rows, last, header, generation, synced FROM mirror_meta WHERE sheet = ?", (sheet,)).fetchone()
+        if not row: return {"rows": 0, "last": None, "header": None, "generation": None, "synced": None}
+        return {"rows": row[0], "last": row[1], "header": json.loads(row[2]) if row[2] else None, "generation": row[3], "synced": row[4]}
+
+    def expire(self, sheet=None):
+        """Make the next sync of `sheet` (or of every sheet) hit the API."""
+        with self._lock:
+            if sheet is None: self._db.execute("UPDATE mirror_meta SET synced = NULL")
+            else: self._db.execute("UPDATE mirror_meta SET synced = NULL WHERE sheet = ?", (sheet,))
+
+    def sync(self, repo, sheet, header=False, force=False):
+        """Bring the mirror of `sheet` up to date. Returns the number of rows added (or re-mirrored)."""
+        with self._lock:
+            meta, gen = self.meta(sheet), repr(repo.generation(sheet))
+            if not force and meta["synced"] and gen == meta["generation"] and time.time() - meta["synced"] < self.ttl: return 0
+            with span("mirror.sync", sheet=sheet) as s:
+                n = meta["rows"]
+                fetched = repo.rows_from(sheet, max(n, 1))
+                if n and (not fetched or row_key(fetched[0]) != meta["last"]):
+                    s["full"] = True; n = 0; fetched = repo.rows_from(sheet, 1)
+                new = fetched[1:] if n else fetched
+                with self._transaction():
+                    if not n: self._db.execute("DELETE FROM mirror_rows WHERE sheet = ?", (sheet,))
+                    self._db.executemany("INSERT OR REPLACE INTO mirror_rows VALUES (?, ?, ?, ?)",
+                                         ((sheet, n + i + 1, json.dumps(r), row_text(r)) for i, r in enumerate(new)))
+                    total = n + len(new)
+                    head = meta["header"] if n else (fetched[0] if header and fetched else None)
+                    self._db.execute("INSERT OR REPLACE INTO mirror_meta VALUES (?, ?, ?, ?, ?, ?)",
+                                     (sheet, total, row_key(fetched[-1]) if fetched else meta["last"],
+                                      json.dumps(head) if head else None, gen, time.time()))
+                s["rows"] = len(new)
+            return len(new)
+
+    # --- views ---
+    def _where(self, sheet, search, filters):
+        meta = self.meta(sheet); header = meta["header"]
+        sql, args = ["sheet = ?", "row > ?", "text != ''"], [sheet, 1 if header else 0]
+        if search:
+            sql.append("text LIKE ? ESCAPE '\\'")
+            args.append("%" + search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        for col, values in (filters or {}).items():
+            if not values or not header or col not in header: continue
+            sql.append(f"json_extract(cells, '$[{header.index(col)}]') IN ({','.join('?' * len(values))})")
+            args.extend(values)
+        return " AND ".join(sql), args
+
+    def count(self, sheet, search="", filters=None):
+        where, args = self._where(sheet, search, filters)
+        with self._lock: return self._db.execute(f"SELECT COUNT(*) FROM mirror_rows WHERE {where}", args).fetchone()[0]
+
+    def page(self, sheet, search="", filters=None, offset=0, limit=PAGE_SIZE, newest_first=True):
+        """One page of rows (lists of cells) matching the search and filters."""
+        where, args = self._where(sheet, search, filters)
+        order = "DESC" if newest_first else "ASC"
+        with self._lock:
+            rows = self._db.execute(f"SELECT cells FROM mirror_rows WHERE {where} ORDER BY row {order} LIMIT ? OFFSET ?",
+                                    args + [limit, offset]).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def distinct(self, sheet, col):
+        """Sorted distinct non-empty values of a header column, for filter widgets."""
+        header = self.meta(sheet)["header"]
+        if not header or col not in header: return []
+        with self._lock:
+            rows = self._db.execute(f"SELECT DISTINCT json_extract(cells, '$[{header.index(col)}]') AS v FROM mirror_rows "
+                                    "WHERE sheet = ? AND row > 1 AND v IS NOT NULL AND v != '' ORDER BY v", (sheet,)).fetchall()
+        return [r[0] for r in rows]
+
+    # --- exports ---
+    def iter_chunks(self, sheet, search="", filters=None, chunk=EXPORT_CHUNK, newest_first=False):
+        """Matching rows in chunks of `chunk`, read with a cursor so the full result never sits in memory."""
+        where, args = self._where(sheet, search, filters)
+        order = "DESC" if newest_first else "ASC"
+        with self._lock:  # own cursor on a snapshot; a concurrent sync waits
+            cur = self._db.cursor()
+            cur.execute(f"SELECT cells FROM mirror_rows WHERE {where} ORDER BY row {order}", args)
+            while True:
+                rows = cur.fetchmany(chunk)
+                if not rows: break
+                yield [json.loads(r[0]) for r in rows]
+
+    def export(self, sheet, fmt="csv", search="", filters=None, chunk=EXPORT_CHUNK):
+        """Write matching rows (header first) to a temporary file and return it open at the start."""
+        header = self.meta(sheet)["header"]
+        with span("mirror.export", sheet=sheet, fmt=fmt) as s:
+            n = 0
+            if fmt == "csv":
+                out = tempfile.TemporaryFile("w+", newline="", encoding="utf-8")
+                writer = csv.writer(out)
+                if header: writer.writerow(header)
+                for rows in self.iter_chunks(sheet, search, filters, chunk): writer.writerows(rows); n += len(rows)
+            else:
+                import xlsxwriter
+                out = tempfile.TemporaryFile("w+b", buffering=0)  # raw file: what st.download_button accepts
+                wb = xlsxwriter.Workbook(out, {"constant_memory": True})
+                ws = wb.add_worksheet(sheet[:31])
+                top = 1 if header else 0
+                if header: ws.write_row(0, 0, header)
+                for rows in self.iter_chunks(sheet, search, filters, chunk):
+                    for r in rows: ws.write_row(top + n, 0, r); n += 1
+                wb.close()
+            s["rows"] = n
+        out.seek(0)
+        return out
@@ -0,0 +1,233 @@
+"""Google Sheets data-access layer.
+
+Every tab reads through one `SheetRepository` per process. Reads of several
+worksheets are fetched together with a single `values_batch_get`; each
+worksheet's values are then cached on their own with a TTL. Writes go through
+the repository too and only invalidate the worksheet they touched, so saving
+an Intel rumor no longer throws away the roster, the block and the news feed.
+
+Every API round trip is traced as a `sheets.*` span (see tracing.py).
+
+`generation(title)` increments whenever a worksheet's cached values change,
+which lets derived caches (parsed rosters, name index) key on it cheaply.
+
+Whole-sheet rewrites go through `apply_changes`: the old and new matrices are
+diffed into a few rectangular ranges, the live cells behind those ranges are
+checked against what we last read (optimistic concurrency), and the changes
+go out in one `batch_update`. Nothing is cleared first, so a failed write
+leaves the sheet as it was rather than blank.
+"""
+import threading
+import time
+
+from tracing import measure, span
+
+DEFAULT_TTL = 600
+MERGE_GAP = 1  # unchanged cells bridged inside a run to save a range
+
+# The two gspread.utils helpers we need, copied so importing the repository does not pull in gspread and google-auth.
+def rowcol_to_a1(row, col):
+    label = ""
+    while col: col, mod = divmod(col - 1, 26); label = chr(65 + mod) + label
+    return f"{label}{row}"
+
+def fill_gaps(rows):
+    width = max(len(r) for r in rows)
+    return [list(r) + [""] * (width - len(r)) for r in rows]
+
+class SheetConflict(Exception):
+    """The sheet changed under us since it was read; nothing was written."""
+
+    def __init__(self, title, ranges):
+        super().__init__(f"'{title}' changed since it was loaded ({len(ranges)} range(s) differ). Refresh and retry.")
+        self.title, self.ranges = title, ranges
+
+def quote_title(title):
+    return "'" + str(title).replace("'", "''") + "'"
+
+def cell(matrix, r, c):
+    if r >= len(matrix) or c >= len(matrix[r]): return ""
+    v = matrix[r][c]
+    return "" if v is None else str(v)
+
+def diff_matrices(old, new, gap=MERGE_GAP):
+    """
+    Minimal change set between two cell matrices (0-based lists of rows).
+    Returns [(a1_range, new_block, old_block)]: per-column runs of changed rows,
+    merged across neighbouring columns that change over the same rows.
+    """
+    rows = max(len(old), len(new)); cols = max([len(r) for r in old + new] or [0])
+    runs = {}  # (r0, r1) -> [columns]
+    for c in range(cols):
+        changed = [r for r in range(rows) if cell(old, r, c) != cell(new, r, c)]
+        start = prev = None
+        for r in changed + [None]:
+            if start is not None and (r is None or r - prev > gap + 1):
+                runs.setdefault((start, prev), []).append(c); start = None
+            if r is not None:
+                if start is None: start = r
+                prev = r
+    changes = []
+    for (r0, r1), cs in sorted(runs.items(), key=lambda x: (x[1][0], x[0][0])):
+        group = [cs[0]]
+        for c in cs[1:] + [None]:
+            if c is not None and c == group[-1] + 1: group.append(c); continue
+            c0, c1 = group[0], group[-1]
+            rng = f"{rowcol_to_a1(r0 + 1, c0 + 1)}:{rowcol_to_a1(r1 + 1, c1 + 1)}"
+            changes.append((rng, [[cell(new, r, k) for k in range(c0, c1 + 1)] for r in range(r0, r1 + 1)],
+                                 [[cell(old, r, k) for k in range(c0, c1 + 1)] for r in range(r0, r1 + 1)]))
+            if c is not None: group = [c]
+    return changes
+
+def ranges_from_cells(cells):
+    """Change set for sparse (row, col, old, new) edits (1-based), one range per vertical run."""
+    by_col = {}
+    for row, col, old, new in cells: by_col.setdefault(col, {})[row] = (old, new)
+    changes = []
+    for col, rows in sorted(by_col.items()):
+        run = []
+        for r in sorted(rows) + [None]:
+            if run and (r is None or r != run[-1] + 1):
+                rng = f"{rowcol_to_a1(run[0], col)}:{rowcol_to_a1(run[-1], col)}"
+                changes.append((rng, [[rows[x][1]] for x in run], [[rows[x][0]] for x in run])); run = []
+            if r is not None: run.append(r)
+    return changes
+
+class SheetRepository:
+    def __init__(self, spreadsheet, ttl=DEFAULT_TTL, ttls=None):
+        self.sh = spreadsheet
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.reads = 0    # API read calls made, for the perf/health views
+        self._values = {}  # title -> (fetched_at, rows)
+        self._gens = {}
+        self._handles = None
+        self._lock = threading.RLock()
+        self.epoch = time.time()  # distinguishes generations of a re-created repository
+
+    # --- metadata ---
+    def _worksheets(self):
+        with self._lock:
+            if self._handles is None:
+                with span("sheets.metadata"): self._handles = self.sh.worksheets()
+                self.reads += 1
+            return self._handles
+
+    def titles(self):
+        return [ws.title for ws in self._worksheets()]
+
+    def title_at(self, index):
+        ws = self._worksheets()
+        return ws[index].title if index < len(ws) else None
+
+    def has(self, title):
+        return title in self.titles()
+
+    def worksheet(self, title):
+        for ws in self._worksheets():
+            if ws.title == title: return ws
+        raise KeyError(f"Worksheet not found: {title}")
+
+    # --- reads ---
+    def _fresh(self, title, now):
+        hit = self._values.get(title)
+        return hit is not None and now - hit[0] < self.ttls.get(title, self.ttl)
+
+    def _store(self, title, rows, now):
+        rows, hit = fill_gaps(rows) if rows else [], self._values.get(title)
+        if hit is None or hit[1] != rows: self._gens[title] = self._gens.get(title, 0) + 1  # a TTL refetch of the same rows keeps it
+        self._values[title] = (now, rows)
+
+    def prefetch(self, titles):
+        """Fetch every stale worksheet in `titles` with one batch_get. Missing worksheets are skipped."""
+        now = time.time()
+        with self._lock:
+            existing = set(self.titles())
+            stale = [t for t in dict.fromkeys(titles) if t in existing and not self._fresh(t, now)]
+            if not stale: return
+            with span("sheets.read", tabs=len(stale)) as s:
+                resp = self.sh.values_batch_get([quote_title(t) for t in stale]); measure(s, received=resp, tokens=False)
+            self.reads += 1
+            for title, vr in zip(stale, resp.get("valueRanges", [])):
+                self._store(title, vr.get("values", []), now)
+
+    def values(self, title):
+        """All cell values of a worksheet (rectangular, like get_all_values)."""
+        with self._lock:
+            if not self._fresh(title, time.time()): self.prefetch([title])
+            if title not in self._values: raise KeyError(f"Worksheet not found: {title}")
+            return self._values[title][1]
+
+    def rows_from(self, title, start=1):
+        """Rows `start`.. (1-based) to the end of a worksheet, straight from the API (not cached)."""
+        ws = self.worksheet(title)
+        last_col = rowcol_to_a1(1, max(ws.col_count, 1))[:-1]
+        with span("sheets.read", tabs=1, start=start) as s:
+            resp = self.sh.values_batch_get([f"{quote_title(title)}!A{start}:{last_col}"]); measure(s, received=resp, tokens=False)
+        self.reads += 1
+        rows = resp.get("valueRanges", [{}])[0].get("values", [])
+        return fill_gaps(rows) if rows else []
+
+    def generation(self, *titles):
+        with self._lock: return (self.epoch,) + tuple(self._gens.get(t, 0) for t in titles)
+
+    # --- invalidation ---
+    def invalidate(self, title=None):
+        with self._lock:
+            if title is None:
+                self._values.clear(); self._handles = None
+                self._gens = {t: g + 1 for t, g in self._gens.items()}
+            else:  # bumped even when uncached, so mirrors of the worksheet notice the write
+                self._values.pop(title, None); self._gens[title] = self._gens.get(title, 0) + 1
+
+    # --- writes (each invalidates only its worksheet) ---
+    def append_row(self, title, row):
+        ws = self.worksheet(title)
+        with span("sheets.append", rows=1) as s: measure(s, sent=[str(v) for v in row], tokens=False); ws.append_row(row)
+        self.invalidate(title)
+
+    def append_rows(self, title, rows):
+        ws = self.worksheet(title)
+        with span("sheets.append", rows=len(rows)) as s: measure(s, sent=[str(v) for r in rows for v in r], tokens=False); ws.append_rows(rows)
+        self.invalidate(title)
+
+    def apply_changes(self, title, old, new, check=True):
+        """Write only the cells that differ between `old` and `new`. Returns the number of ranges sent."""
+        return self.write_changes(title, diff_matrices(old, new), new, check)
+
+    def write_changes(self, title, changes, new, check=True):
+        """Send a precomputed change set; `new` is the full matrix afterwards (written through to the cache)."""
+        if not changes: return 0
+        ws = self.worksheet(title)
+        if check:
+            with span("sheets.check", ranges=len(changes)) as s:
+                live = self.sh.values_batch_get([f"{quote_title(title)}!{rng}" for rng, _, _ in changes]); measure(s, received=live, tokens=False)
+            self.reads += 1
+            stale = [rng for (rng, _, before), vr in zip(changes, live.get("valueRanges", []))
+                     if diff_matrices(before, vr.get("values", []), gap=0)]
+            if stale: self.invalidate(title); raise SheetConflict(title, stale)
+        need_rows = len(new)
+        if need_rows > ws.row_count: ws.add_rows(need_rows - ws.row_count)
+        with span("sheets.write", ranges=len(changes)) as s:
+            measure(s, sent=[str(v) for _, block, _ in changes for r in block for v in r], tokens=False)
+            ws.batch_update([{"range": rng, "values": block} for rng, block, _ in changes])
+        with self._lock: self._store(title, [list(r) for r in new], time.time())
+        return len(changes)
+
+    def add_worksheet(self, title, rows, cols, header=None):
+        with span("sheets.admin", op="add"):
+            ws = self.sh.add_worksheet(title, rows, cols)
+            if header: ws.append_row(header)
+        with self._lock: self._handles = None
+        self.invalidate(title)
+        return ws
+
+    def ensure_worksheet(self, title, rows, cols, header=None):
+        return self.worksheet(title) if self.has(title) else self.add_worksheet(title, rows, cols, header)
+
+    def del_worksheet(self, title):
+        if self.has(title):
+            ws = self.worksheet(title)
+            with span("sheets.admin", op="delete"): self.sh.del_worksheet(ws)
+        with self._lock: self._handles = None
+        self.invalidate(title)
@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from league_context import find_mentions  # noqa: E402
+from name_index import PlayerNameIndex  # noqa: E402
+
+LEAGUE = {"Rays": [{"name": n} for n in ("Brandon Lowe", "Chris Sale", "Aaron Judge", "Matthew Olson", "Ronald Acuña Jr.")],
+          "Cubs": [{"name": n} for n in ("Jordan Walker", "Evan Carter", "Zach Neto", "J.D. Martinez")]}
+INDEX = PlayerNameIndex(LEAGUE)
+
+def names(text):
+    return [n for n, _ in find_mentions(text, LEAGUE, INDEX)[1]]
+
+def test_other_players_sharing_a_last_name_are_not_tagged():
+    for text in ("Josh Lowe lands on IL", "Christian Walker 3-year deal", "Carter Kieboom released",
+                 "Sale of the Rays finalized", "Judge rules on the case", "a judge ruled"):
+        assert names(text) == [], text
+
+def test_full_names_initials_and_first_name_prefixes_are_tagged():
+    assert names("Ronald Acuna Jr. returns") == ["Ronald Acuña Jr."]
+    assert names("A. Judge homers") == ["Aaron Judge"]
+    assert names("J.D. Martinez signs") == ["J.D. Martinez"]
+    assert sorted(names("Z. Neto for Matt Olson")) == ["Matthew Olson", "Zach Neto"]
+    assert names("Brandn Lowe trade") == ["Brandon Lowe"]
+
+def test_mentions_uses_exact_names_only():
+    assert [INDEX.names[i] for i in INDEX.mentions("Brandon Lowe and Brandn Lowe and B. Lowe")] == ["Brandon Lowe"]
+    assert INDEX.mentions("Matt Olson") == []
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from league_model import LeagueModel, patch_matrix  # noqa: E402
+from name_index import NameMatcher  # noqa: E402
+
+TEAMS = ["Aces", "Bombers", "Comets", "Dragons"]
+
+def league_matrix(rng, teams=TEAMS):
+    cols = []
+    for t in teams:
+        hitters = [f"{t} Hitter {i}" for i in range(rng.randint(2, 6))]
+        pitchers = [f"{t} Pitcher {i}" for i in range(rng.randint(0, 4))]
+        col = [t, "HITTERS:"] + hitters + ["PITCHERS:"] + pitchers
+        if rng.random() < 0.5: col.insert(rng.randint(3, len(col)), "")  # a blank line inside a section
+        cols.append(col)
+    height = max(len(c) for c in cols)
+    return [[c[r] if r < len(c) else "" for c in cols] for r in range(height)]
+
+def parse(matrix):
+    return LeagueModel.from_matrix(matrix, NameMatcher(TEAMS), TEAMS)
+
+def snapshot(league):
+    return {t: [(p.name, p.row, p.col, p.category) for p in league[t]] for t in league}
+
+def test_random_trades_reparse_and_undo():
+    rng = random.Random(11)
+    for _ in range(200):
+        matrix = league_matrix(rng); league = parse(matrix); before = snapshot(league)
+        team_a, team_b = rng.sample(TEAMS, 2)
+        give = [p.name for p in rng.sample(league[team_a], rng.randint(0, min(3, len(league[team_a]))))]
+        get = [p.name for p in rng.sample(league[team_b], rng.randint(0, min(3, len(league[team_b]))))]
+        trade = league.apply_trade(team_a, give, team_b, get)
+
+        patched = patch_matrix(matrix, trade.cells)
+        assert snapshot(parse(patched)) == snapshot(league)
+        assert all(matrix[r - 1][c - 1] == old for r, c, old, _ in trade.cells if r <= len(matrix))
+
+        league.undo(trade)
+        assert snapshot(league) == before
+        assert snapshot(league) == snapshot(parse(matrix))
+
+def test_undo_refreshes_receiving_team_view():
+    matrix = [["Aces", "Bombers"], ["HITTERS:", "HITTERS:"], ["Cy Three", "Bo One"], ["PITCHERS:", "PITCHERS:"]]
+    league = parse(matrix)
+    trade = league.apply_trade("Aces", ["Cy Three"], "Bombers", [])
+    assert [p.name for p in league["Bombers"]] == ["Bo One", "Cy Three"]
+    league.undo(trade)
+    assert [p.name for p in league["Bombers"]] == ["Bo One"]
+    assert [p.name for p in league["Aces"]] == ["Cy Three"]
+
+def test_same_name_players_are_kept_apart():
+    matrix = [["Aces", "Bombers"], ["HITTERS:", "HITTERS:"], ["Will Smith", "Will Smith"], ["PITCHERS:", "PITCHERS:"],
+              ["", "Will Smith"]]
+    league = parse(matrix)
+    assert len(league["Bombers"]) == 2
+    trade = league.apply_trade("Aces", ["Will Smith"], "Bombers", ["Will Smith", "Will Smith"])
+    assert [p.name for p in league["Aces"]] == ["Will Smith", "Will Smith"] and len(league["Bombers"]) == 1
+    assert snapshot(parse(patch_matrix(matrix, trade.cells))) == snapshot(league)
+    league.undo(trade)
+    assert snapshot(league) == snapshot(parse(matrix))
@@ -0,0 +1,153 @@
+"""Per-phase tracing: latency, bytes, tokens and estimated cost.
+
+`span(phase, **attrs)` times a block and records one flat dict per call:
+phase, run id, duration in ms, and whatever the caller sets on the yielded span
+(model, request/response bytes, token counts). When a span has a model and
+token counts, an estimated USD cost is added from `PRICES`.
+
+Spans go to a bounded in-memory window (for the Perf view) and, once
+`configure()` has pointed the tracer at a file, to a size-rotated JSONL trace.
+`run(label)` tags every span started inside it (including child asyncio tasks)
+with one run id, so a slow analysis can be broken down phase by phase.
+"""
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from league_context import estimate_tokens
+
+MAX_BYTES = 2 * 1024 * 1024
+BACKUPS = 3
+WINDOW = 2000  # spans kept in memory for summaries
+PRICES = {  # USD per 1M (input, output) tokens; matched by substring of the model id
+    "perplexity/sonar": (1.0, 1.0),
+    "openai/gpt-4o": (2.5, 10.0),
+    "anthropic/claude-3.5-sonnet": (3.0, 15.0),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini": (0.10, 0.40),
+}
+
+_run = contextvars.ContextVar("trace_run", default=None)
+_run_ids = itertools.count(1)
+
+def estimate_cost(model, tokens_in, tokens_out):
+    price = next((p for k, p in PRICES.items() if k in str(model)), None)
+    if price is None: return None
+    return round((tokens_in * price[0] + tokens_out * price[1]) / 1e6, 6)
+
+def _size(x):
+    if isinstance(x, str): return len(x.encode())
+    if isinstance(x, (list, tuple)): return sum(_size(i) for i in x)
+    if isinstance(x, dict): return len(json.dumps(x, default=str).encode())
+    return 0  # images and other payloads are not counted
+
+def _text(x):
+    if isinstance(x, str): return x
+    if isinstance(x, (list, tuple)): return "".join(_text(i) for i in x)
+    if isinstance(x, dict): return json.dumps(x, default=str)
+    return ""
+
+def measure(s, sent=None, received=None, tokens=True):
+    """Fill request/response bytes (and, for model calls, estimated token counts) on a span."""
+    if sent is not None:
+        s["bytes_in"] = _size(sent)
+        if tokens: s["tokens_in"] = estimate_tokens(_text(sent))
+    if received is not None:
+        s["bytes_out"] = _size(received)
+        if tokens: s["tokens_out"] = estimate_tokens(_text(received))
+
+def percentile(values, q):
+    s = sorted(values)
+    return s[min(int(len(s) * q), len(s) - 1)] if s else None
+
+class Tracer:
+    def __init__(self, path=None, max_bytes=MAX_BYTES, backups=BACKUPS, window=WINDOW):
+        self.path, self.max_bytes, self.backups = path, max_bytes, backups
+        self.spans = deque(maxlen=window)
+        self._lock = threading.Lock()
+        if path: self._load()
+
+    def _load(self):
+        """Seed the window from the current trace file so summaries survive restarts."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in deque(f, maxlen=self.spans.maxlen):
+                    try: self.spans.append(json.loads(line))
+                    except ValueError: pass
+        except OSError: pass
+
+    def record(self, s):
+        self.spans.append(s)
+        if not self.path: return
+        line = json.dumps(s, default=str) + "\n"
+        with self._lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes: self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f: f.write(line)
+            except OSError: pass  # tracing never breaks the app
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"): os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def summary(self, runs=None):
+        """{phase: {n, p50, p95 (ms), errors, tokens, cost}} over the window, or the last `runs` run ids."""
+        spans = list(self.spans)
+        if runs:
+            recent = set(list(dict.fromkeys(s["run"] for s in spans if s.get("run")))[-runs:])
+            spans = [s for s in spans if s.get("run") in recent]
+        by_phase = {}
+        for s in spans: by_phase.setdefault(s["phase"], []).append(s)
+        out = {}
+        for phase, ss in sorted(by_phase.items()):
+            ms = [s["ms"] for s in ss]
+            out[phase] = {"n": len(ss), "p50": percentile(ms, 0.5), "p95": percentile(ms, 0.95),
+                          "errors": sum(1 for s in ss if s.get("error")),
+                          "tokens": sum(s.get("tokens_in", 0) + s.get("tokens_out", 0) for s in ss),
+                          "cost": round(sum(s.get("cost") or 0 for s in ss), 4)}
+        return out
+
+TRACER = Tracer()  # in-memory until configure()
+
+def configure(path, **kwargs):
+    global TRACER
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    TRACER = Tracer(path, **kwargs)
+    return TRACER
+
+@contextmanager
+def span(phase, **attrs):
+    s = {"phase": phase, "run": _run.get(), "ts": round(time.time(), 3), **attrs}
+    t0 = time.perf_counter()
+    try: yield s
+    except BaseException as e: s["error"] = type(e).__name__; raise
+    finally:
+        s["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        if s.get("model") and ("tokens_in" in s or "tokens_out" in s):
+            s["cost"] = estimate_cost(s["model"], s.get("tokens_in", 0), s.get("tokens_out", 0))
+        TRACER.record(s)
+
+@contextmanager
+def run(label):
+    """Group the spans of one pipeline run (and of tasks it spawns) under a fresh run id."""
+    token = _run.set(f"{label}-{int(time.time())}-{next(_run_ids)}")
+    try:
+        with span(label) as s: yield s
+    finally: _run.reset(token)
+
+def traced(phase):
+    """Decorator: wrap a plain (sync) function in a span."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with span(phase): return fn(*args, **kwargs)
+        return inner
+    return wrap
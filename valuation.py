@@ -0,0 +1,160 @@
+"""Vectorized trade valuation over a local projections table.
+
+Every rostered player (from `flatten_roster_to_df`) is joined by normalized
+name to a projections CSV/Parquet and turned into a row of per-category
+z-scores (lower-is-better categories flipped, optional dynasty age curve).
+Team strength is the sum of its players' rows. Each team weighs categories by
+need (weak categories count more), so `Z @ W.T` gives every player's value
+to every team in one matrix product; `V` keeps only the part above replacement
+level, since bench depth adds nothing to category totals.
+
+Because the valuation is linear, a trade's value to either side is a sum of
+entries of `V`, and every 1-for-1, 2-for-1 and 1-for-2 deal between one team
+and the rest of the league can be scored as broadcast array operations. The
+side that ends up with an extra player drops its weakest one; the side with an
+open spot fills it at replacement level (its current weakest player). A deal is
+feasible when the partner does not lose more than `slack` by its own needs.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from name_index import normalize_name
+
+CATEGORIES = {"R": 1, "HR": 1, "RBI": 1, "SB": 1, "OBP": 1, "K": 1, "W": 1, "SV": 1, "ERA": -1, "WHIP": -1}
+NEED_SCALE = 0.25      # how strongly a team's weak categories are up-weighted
+WEIGHT_RANGE = (0.5, 1.5)
+REPLACEMENT_QUANTILE = 0.6  # rostered players at or below this quantile are bench depth, worth nothing
+ACCEPT_SLACK = 0.5     # partner may lose this much value (by its own weights) and still accept
+PEAK_AGE, AGE_SLOPE, AGE_RANGE = 27, 0.03, (0.75, 1.2)  # 3-year dynasty window multiplier
+
+def load_projections(path):
+    """Projections table with a 'Player' column and numeric category columns; None if the file is missing."""
+    if not path or not os.path.exists(path): return None
+    df = pd.read_parquet(path) if path.endswith((".parquet", ".pq")) else pd.read_csv(path)
+    df = df.rename(columns={c: c.strip() for c in df.columns})
+    if "Player" not in df.columns: raise ValueError(f"{path} needs a 'Player' column")
+    df["key"] = df["Player"].map(normalize_name)
+    return df.drop_duplicates("key")
+
+def same_team_pairs(ids, teams):
+    """All unordered pairs of `ids` that share a team, as two index arrays."""
+    order = np.argsort(teams, kind="stable"); ids, teams = ids[order], teams[order]
+    starts = np.flatnonzero(np.r_[True, teams[1:] != teams[:-1]])
+    out = [np.triu_indices(n, 1) for n in np.diff(np.r_[starts, len(ids)])]
+    if not out: return np.array([], int), np.array([], int)
+    first = np.concatenate([s + x for s, (x, _) in zip(starts, out)])
+    second = np.concatenate([s + y for s, (_, y) in zip(starts, out)])
+    return ids[first], ids[second]
+
+class ValuationEngine:
+    def __init__(self, roster_df, projections, categories=CATEGORIES):
+        df = roster_df.assign(key=roster_df["Player"].map(normalize_name))
+        proj = projections if "key" in projections.columns else projections.assign(key=projections["Player"].map(normalize_name))
+        proj = proj.drop(columns=[c for c in ("Player", "Team", "Category") if c in proj.columns])
+        df = df.merge(proj, on="key", how="left")
+        self.categories = [c for c in categories if c in df.columns]
+        if not self.categories: raise ValueError("projections share no category columns with CATEGORIES")
+        self.players = df.reset_index(drop=True)
+        self.teams = list(dict.fromkeys(df["Team"]))
+        self.team_of = df["Team"].map({t: i for i, t in enumerate(self.teams)}).to_numpy()
+        self.projected = df[self.categories].notna().any(axis=1).to_numpy()
+
+        raw = df[self.categories].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        mean, std = np.nanmean(raw, axis=0), np.nanstd(raw, axis=0)
+        z = (raw - mean) / np.where(std > 0, std, 1) * np.array([categories[c] for c in self.categories])
+        z = np.nan_to_num(z)  # no projection in a category contributes nothing
+        if "Age" in df.columns:
+            age = pd.to_numeric(df["Age"], errors="coerce").fillna(PEAK_AGE).to_numpy()
+            z *= np.clip(1 + (PEAK_AGE - age) * AGE_SLOPE, *AGE_RANGE)[:, None]
+        self.Z = z
+
+        n_teams = len(self.teams)
+        self.S = np.zeros((n_teams, len(self.categories)))
+        np.add.at(self.S, self.team_of, z)
+        spread = self.S.std(axis=0)
+        self.W = np.clip(1 - NEED_SCALE * (self.S - self.S.mean(axis=0)) / np.where(spread > 0, spread, 1), *WEIGHT_RANGE)
+        raw_v = z @ self.W.T  # (players, teams): value of each player to each team
+        self.V = np.maximum(raw_v - np.quantile(raw_v, REPLACEMENT_QUANTILE, axis=0), 0)  # above replacement only
+        own = self.V[np.arange(len(df)), self.team_of]
+        self.worst = np.full(n_teams, np.inf); np.minimum.at(self.worst, self.team_of, own)
+        self.worst[np.isinf(self.worst)] = 0.0
+
+    def __len__(self):
+        return len(self.players)
+
+    def strengths(self):
+        return pd.DataFrame(self.S, index=self.teams, columns=self.categories)
+
+    def _ids(self, names, team=None):
+        keys = {normalize_name(n) for n in names}
+        hit = self.players["key"].isin(keys).to_numpy()
+        if team is not None: hit = hit & (self.team_of == self.teams.index(team))
+        return np.flatnonzero(hit)
+
+    def search(self, team, top_n=10, give=None, targets=None, slack=ACCEPT_SLACK):
+        """
+        Best feasible trades for `team` across the league, as a DataFrame sorted by your gain.
+        give: only offer these players. targets: boolean mask (per row of `players`) of acceptable incoming players.
+        """
+        u_team = self.teams.index(team)
+        mine = self.team_of == u_team
+        u = self._ids(give, team) if give else np.flatnonzero(mine)
+        V, worst = self.V, self.worst
+        vu = V[:, u_team]
+        o_mask = ~mine & self.projected & (vu > 0)  # incoming players below your replacement level add nothing
+        if targets is not None: o_mask &= np.asarray(targets, dtype=bool)
+        o = np.flatnonzero(o_mask)
+        if not len(u) or not len(o): return self._frame([])
+        tb = self.team_of[o]
+        rows = []
+
+        # 1-for-1
+        g_you = vu[o][None, :] - vu[u][:, None]
+        g_them = V[np.ix_(u, tb)] - V[o, tb][None, :]
+        rows += self._top(g_you, g_them, slack, top_n, lambda i, j: ([u[i]], [o[j]]), "1-for-1")
+
+        # 2-for-1: you consolidate and fill the open spot at replacement level; the partner drops its weakest
+        if len(u) >= 2:
+            pa, pb = np.triu_indices(len(u), 1); a1, a2 = u[pa], u[pb]
+            g_you = (vu[o] + worst[u_team])[None, :] - (vu[a1] + vu[a2])[:, None]
+            va1, va2 = V[np.ix_(a1, tb)], V[np.ix_(a2, tb)]
+            drop = np.minimum(np.minimum(va1, va2), worst[tb][None, :])
+            g_them = va1 + va2 - V[o, tb][None, :] - drop
+            rows += self._top(g_you, g_them, slack, top_n, lambda i, j: ([a1[i], a2[i]], [o[j]]), "2-for-1")
+
+        # 1-for-2: the mirror image, two players from the same partner
+        b1, b2 = same_team_pairs(o, tb)
+        if len(b1):
+            bt = self.team_of[b1]
+            drop = np.minimum(np.minimum(vu[b1], vu[b2]), worst[u_team])
+            g_you = (vu[b1] + vu[b2] - drop)[None, :] - vu[u][:, None]
+            g_them = V[np.ix_(u, bt)] + worst[bt][None, :] - (V[b1, bt] + V[b2, bt])[None, :]
+            rows += self._top(g_you, g_them, slack, top_n, lambda i, j: ([u[i]], [b1[j], b2[j]]), "1-for-2")
+
+        rows.sort(key=lambda r: -r[3])
+        return self._frame(rows[:top_n])
+
+    def _top(self, g_you, g_them, slack, n, pick, kind):
+        score = np.where(g_them >= -slack, g_you, -np.inf).ravel()
+        k = min(n, int(np.isfinite(score).sum()))
+        if not k: return []
+        best = np.argpartition(-score, k - 1)[:k]
+        out = []
+        for flat in best:
+            i, j = divmod(int(flat), g_you.shape[1]); give, get = pick(i, j)
+            out.append((kind, list(give), list(get), float(g_you.flat[flat]), float(g_them.flat[flat])))
+        return out
+
+    def _frame(self, rows):
+        names = self.players["Player"]
+        return pd.DataFrame([{"Type": k, "Give": ", ".join(names[i] for i in give), "Get": ", ".join(names[i] for i in get),
+                              "Partner": self.teams[self.team_of[get[0]]], "Your Gain": round(gy, 2), "Their Gain": round(gt, 2)}
+                             for k, give, get, gy, gt in rows], columns=["Type", "Give", "Get", "Partner", "Your Gain", "Their Gain"])
+
+    def impact(self, team, give, get):
+        """Category strength of `team` before and after sending `give` and receiving `get` (player names)."""
+        t = self.teams.index(team)
+        delta = self.Z[self._ids(get)].sum(axis=0) - self.Z[self._ids(give, team)].sum(axis=0)
+        return pd.DataFrame({"Current": self.S[t], "Post-Trade": self.S[t] + delta}, index=pd.Index(self.categories, name="Category")).round(2)